@@ -0,0 +1,6 @@
+"""Entry point for `python -m src`; see src/cli.py."""
+import sys
+
+from src.cli import main
+
+sys.exit(main())
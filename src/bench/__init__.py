@@ -0,0 +1,43 @@
+"""
+Small benchmark harness for the game cores and tooling around them.
+
+Benchmarks register themselves with the @benchmark decorator and are run via
+`python -m src.bench [name ...]`. Each one prints a plain-text table.
+"""
+import time
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Register a benchmark function under name. It is called as fn(steps)."""
+    def decorator(fn):
+        BENCHMARKS[name] = fn
+        return fn
+    return decorator
+
+
+def rate(fn, n):
+    """Call fn() n times and return calls per second."""
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    elapsed = time.perf_counter() - start
+    return n / elapsed if elapsed > 0 else float("inf")
+
+
+def print_table(title, headers, rows):
+    """Print rows as a left-aligned text table."""
+    cells = [[str(h) for h in headers]] + [[_fmt(v) for v in row] for row in rows]
+    widths = [max(len(r[i]) for r in cells) for i in range(len(headers))]
+    print(f"\n{title}")
+    for i, row in enumerate(cells):
+        print("  ".join(c.ljust(w) for c, w in zip(row, widths)))
+        if i == 0:
+            print("  ".join("-" * w for w in widths))
+
+
+def _fmt(value):
+    if isinstance(value, float):
+        return f"{value:,.1f}"
+    return str(value)
@@ -0,0 +1,37 @@
+"""
+Run registered benchmarks.
+
+Usage:
+    python -m src.bench                 # run everything
+    python -m src.bench snake_board     # run selected benchmarks
+    python -m src.bench --list
+"""
+import argparse
+
+from . import BENCHMARKS
+from . import dataset, inference, logging_overhead, render_cost, rollout, scaling, startup  # noqa: F401  (registers benchmarks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run benchmarks")
+    parser.add_argument("names", nargs="*", help="Benchmarks to run (default: all)")
+    parser.add_argument("--steps", type=int, default=20000,
+                        help="Work per measurement (steps, samples, ...)")
+    parser.add_argument("--list", action="store_true", help="List benchmarks and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for name in sorted(BENCHMARKS):
+            print(name)
+        return
+
+    names = args.names or sorted(BENCHMARKS)
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        parser.error(f"Unknown benchmark(s): {', '.join(unknown)}")
+    for name in names:
+        BENCHMARKS[name](args.steps)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Trajectory dataset export and streaming-load throughput for each shard format.
+"""
+import random
+import tempfile
+import time
+
+from . import benchmark, print_table
+from src.common.dataset import TrajectoryWriter, dataset_info, iter_minibatches
+from src.snake.game import SnakeGame
+
+FORMATS = (  # (label, encoding, compress)
+    ("npy, raw float32", "raw", False),
+    ("npy, bit-packed", "bits", False),
+    ("npz, bit-packed", "bits", True),
+)
+BATCH_SIZE = 256
+
+
+def _transitions(steps):
+    """Random-play snake transitions, generated up front so only I/O is timed."""
+    random.seed(0)
+    game = SnakeGame()
+    game.seed(0)
+    obs = game.reset()
+    rows = []
+    for _ in range(steps):
+        action = random.randrange(4)
+        next_obs, reward, done, _ = game.step(action)
+        rows.append((obs, action, reward, done, next_obs))
+        obs = game.reset() if done else next_obs
+    return rows
+
+
+@benchmark("dataset")
+def dataset(steps):
+    """Export steps/sec, bytes/step and minibatch samples/sec for snake trajectories."""
+    rows = _transitions(steps)
+    table = []
+    for label, encoding, compress in FORMATS:
+        with tempfile.TemporaryDirectory() as out_dir:
+            start = time.perf_counter()
+            writer = TrajectoryWriter(out_dir, (20, 20, 2), encoding=encoding, action_dtype="uint8",
+                                      shard_steps=max(1000, steps // 8), compress=compress)
+            for obs, action, reward, done, next_obs in rows:
+                writer.add(0, obs, action, reward, done, False, next_obs)
+            writer.close()
+            write_rate = writer.steps / (time.perf_counter() - start)
+            info = dataset_info(out_dir)
+
+            start = time.perf_counter()
+            samples = 0
+            for batch in iter_minibatches(out_dir, batch_size=BATCH_SIZE, seed=0, shards_in_memory=2):
+                samples += len(batch["actions"])
+            read_rate = samples / (time.perf_counter() - start)
+        table.append([label, write_rate, info["bytes"] / max(1, info["steps"]), read_rate])
+    print_table(f"dataset: snake 20x20 trajectories, shuffled minibatches of {BATCH_SIZE}",
+                ["format", "export steps/s", "bytes/step", "load samples/s"], table)
@@ -0,0 +1,53 @@
+"""
+Inference server throughput and latency for different micro-batching knobs.
+"""
+import multiprocessing
+
+from . import benchmark, print_table
+from src.inference import InferenceServer
+
+CLIENTS = 4
+SETTINGS = (  # (slots per client, max_batch_size, max_wait seconds)
+    (1, 1, 0.0),
+    (1, 4, 0.0005),
+    (8, 8, 0.0),
+    (8, 32, 0.0005),
+    (8, 32, 0.002),
+)
+
+
+def _client(policy, requests, barrier):
+    import numpy as np
+    obs = np.zeros((policy.size,) + policy._slots()["obs"].shape[1:], dtype=np.float32)
+    barrier.wait()  # all clients start together, after process startup
+    for _ in range(requests):
+        policy.select_actions(obs)
+    policy.close()
+
+
+@benchmark("inference")
+def inference(steps):
+    """
+    Requests/sec and latency with CLIENTS processes requesting snake actions.
+
+    obs/s is the server's count over the time from the first request to the
+    last reply, so client process startup isn't included.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    rows = []
+    for slots, max_batch_size, max_wait in SETTINGS:
+        server = InferenceServer("snake", "random", clients=[slots] * CLIENTS, max_batch_size=max_batch_size,
+                                 max_wait=max_wait, report_interval=0, log=None)
+        policies = server.start()
+        requests = max(1, steps // (CLIENTS * slots))
+        barrier = ctx.Barrier(CLIENTS)
+        procs = [ctx.Process(target=_client, args=(p, requests, barrier)) for p in policies]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join()
+        stats = server.stop()
+        rows.append([f"{CLIENTS}x{slots}", max_batch_size, 1000 * max_wait, stats["obs_per_s"],
+                     stats["mean_batch"], f"{stats['p50_ms']:.3f}", f"{stats['p99_ms']:.3f}"])
+    print_table("inference: micro-batched action serving (random agent, snake obs)",
+                ["clients x slots", "max batch", "max wait ms", "obs/s", "mean batch", "p50 ms", "p99 ms"], rows)
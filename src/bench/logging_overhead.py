@@ -0,0 +1,45 @@
+"""
+Cost of per-step metrics logging relative to a bare game step.
+"""
+import random
+import tempfile
+
+from . import benchmark, print_table, rate
+from src.common.metrics import MetricsWriter
+from src.flappy.game import FlappyGame
+
+
+@benchmark("metrics_log")
+def metrics_log(steps):
+    """MetricsWriter.log() calls/sec, and FlappyGame steps/sec with and without it."""
+    random.seed(0)
+    game = FlappyGame()
+    game.reset()
+
+    def bare():
+        if game.step(random.randrange(2))[2]:
+            game.reset()
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        writer = MetricsWriter(out_dir, "steps", ("episode", "step", "action", "reward"))
+        counter = [0]
+
+        def log_only():
+            counter[0] += 1
+            writer.log(0, counter[0], 1, 0.01)
+
+        def logged():
+            action = random.randrange(2)
+            _, reward, done, _ = game.step(action)
+            counter[0] += 1
+            writer.log(0, counter[0], action, reward)
+            if done:
+                game.reset()
+
+        rows = [
+            ["log() only", rate(log_only, steps)],
+            ["step", rate(bare, steps)],
+            ["step + log()", rate(logged, steps)],
+        ]
+        writer.close()
+    print_table("metrics_log: per-step logging overhead", ["loop", "calls/s"], rows)
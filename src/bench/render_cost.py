@@ -0,0 +1,60 @@
+"""
+Per-frame cost of the dirty-rect renderers vs a full repaint.
+
+Uses SDL's dummy video driver unless SDL_VIDEODRIVER is already set, so it
+runs headless.
+"""
+import os
+import random
+
+from . import benchmark, print_table, rate
+
+
+@benchmark("render")
+def render_frames(steps):
+    """Frames/sec for FlappyRenderer/SnakeRenderer, incremental vs forced full redraw."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    from src.common import render
+    from src.flappy.game import FlappyGame
+    from src.snake.game import SnakeConfig, SnakeGame
+
+    frames = max(1, steps // 10)
+    rows = []
+
+    flappy = FlappyGame()
+    flappy.seed(0)
+    obs = [flappy.reset()]
+    screen = render.open_window((flappy.SCREEN_W, flappy.SCREEN_H))
+    renderer = render.FlappyRenderer(flappy, screen)
+
+    def flappy_step():
+        if flappy.done:
+            obs[0] = flappy.reset()
+        else:
+            obs[0] = flappy.step(1 if obs[0][0] > obs[0][3] else 0)[0]
+
+    for label, force in (("dirty rects", False), ("full redraw", True)):
+        def frame():
+            flappy_step()
+            render.present(renderer.draw(force=force))
+        rows.append(["flappy", label, rate(frame, frames)])
+
+    for n in (20, 100):
+        snake = SnakeGame(SnakeConfig(cols=n, rows=n))
+        snake.seed(0)
+        snake.reset()
+        cell = render.snake_cell_size(snake)
+        screen = render.open_window((n * cell, n * cell))
+        renderer = render.SnakeRenderer(snake, screen, cell)
+        rng = random.Random(0)
+        for label, force in (("dirty rects", False), ("full redraw", True)):
+            def frame():
+                if snake.done:
+                    snake.reset()
+                else:
+                    snake.step(rng.randrange(4))
+                render.present(renderer.draw(force=force))
+            rows.append([f"snake {n}x{n}", label, rate(frame, frames)])
+
+    render.pygame.quit()
+    print_table("render: game step + draw + display update", ["game", "mode", "frames/s"], rows)
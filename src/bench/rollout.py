@@ -0,0 +1,49 @@
+"""
+Decision rate and survival of the Flappy rollout (lookahead) agent.
+"""
+import time
+
+from . import benchmark, print_table
+from src.flappy.agents.rollout_agent import RolloutAgent
+from src.flappy.game import FlappyConfig, FlappyGame
+
+SETTINGS = (  # (label, pipe_interval_ticks, agent kwargs)
+    ("default pipes", 25, {}),
+    ("spaced pipes (90)", 90, {}),
+    ("spaced pipes, 1024 samples", 90, {"samples": 1024}),
+    ("spaced pipes, 5ms budget", 90, {"time_budget": 0.005}),
+)
+
+
+class _GameEnv:
+    """Just enough of an env for RolloutAgent.attach()."""
+
+    def __init__(self, game):
+        self.game = game
+        self.unwrapped = self
+
+
+@benchmark("rollout_agent")
+def rollout_agent(steps):
+    """Decisions/sec (vs the 60/s real-time target) and deaths per 1000 ticks."""
+    n = max(100, steps // 4)
+    rows = []
+    for label, interval, kwargs in SETTINGS:
+        game = FlappyGame(FlappyConfig(pipe_interval_ticks=interval))
+        game.seed(0)
+        game.reset()
+        agent = RolloutAgent(None, seed=0, **kwargs)
+        agent.attach([_GameEnv(game)])
+        times, deaths = [], 0
+        for _ in range(n):
+            start = time.perf_counter()
+            action = agent.select_action(None)
+            times.append(time.perf_counter() - start)
+            if game.step(action)[2]:
+                deaths += not game.truncated
+                game.reset()
+        times.sort()
+        rows.append([label, n / sum(times), f"{1000 * sum(times) / n:.2f}", f"{1000 * times[int(0.99 * n)]:.2f}",
+                     1000 * deaths / n])
+    print_table(f"rollout_agent: {n} decisions per setting", ["setting", "decisions/s", "mean ms", "p99 ms",
+                                                               "deaths/1000 ticks"], rows)
@@ -0,0 +1,72 @@
+"""
+Steps/sec of the headless game cores as the board / screen grows.
+"""
+import random
+
+from . import benchmark, print_table, rate
+from src.flappy.game import FlappyConfig, FlappyGame
+from src.snake.game import SnakeConfig, SnakeGame
+
+SNAKE_SIZES = (10, 20, 50, 100)
+FLAPPY_WIDTHS = (400, 1600, 6400)
+
+
+def _snake_stepper(game):
+    def step():
+        _, _, done, _ = game.step(random.randrange(4))
+        if done:
+            game.reset()
+    return step
+
+
+def _flappy_stepper(game):
+    def step():
+        # Flap when below the next gap so episodes last long enough to
+        # exercise pipe bookkeeping, not just reset().
+        obs, _, done, _ = game.step(1 if obs_holder[0][0] > obs_holder[0][3] else 0)
+        obs_holder[0] = obs
+        if done:
+            obs_holder[0] = game.reset()
+    obs_holder = [game.reset()]
+    return step
+
+
+@benchmark("snake_board")
+def snake_board(steps):
+    """SnakeGame steps/sec (random policy, obs included) vs board size."""
+    random.seed(0)
+    rows = []
+    for n in SNAKE_SIZES:
+        game = SnakeGame(SnakeConfig(cols=n, rows=n))
+        game.seed(0)
+        game.reset()
+        rows.append([f"{n}x{n}", rate(_snake_stepper(game), steps)])
+    print_table("snake_board: SnakeGame.step", ["board", "steps/s"], rows)
+
+
+@benchmark("snake_crowded")
+def snake_crowded(steps):
+    """Food respawn cost when the snake fills most of the board."""
+    random.seed(0)
+    rows = []
+    for n in SNAKE_SIZES:
+        game = SnakeGame(SnakeConfig(cols=n, rows=n))
+        game.reset()
+        # Fake a long snake: mark ~90% of the cells as occupied
+        game._occupied = set((x, y) for y in range(n) for x in range(n) if (x + y) % 10)
+        for x, y in game._occupied:
+            game._grid[y, x, 0] = 1.0
+        rows.append([f"{n}x{n}", rate(game._random_cell, max(1, steps // 10))])
+    print_table("snake_crowded: food spawn at ~90% occupancy", ["board", "spawns/s"], rows)
+
+
+@benchmark("flappy_screen")
+def flappy_screen(steps):
+    """FlappyGame steps/sec vs screen width (more pipes in flight)."""
+    random.seed(0)
+    rows = []
+    for w in FLAPPY_WIDTHS:
+        game = FlappyGame(FlappyConfig(screen_w=w))
+        game.seed(0)
+        rows.append([w, rate(_flappy_stepper(game), steps)])
+    print_table("flappy_screen: FlappyGame.step", ["screen_w", "steps/s"], rows)
@@ -0,0 +1,72 @@
+"""
+Import cost of each entry point, measured in fresh interpreter processes.
+"""
+import statistics
+import subprocess
+import sys
+import time
+
+from . import benchmark, print_table
+from src.common.settings import PROJECT_ROOT
+
+ENTRY_POINTS = (
+    "src.cli",
+    "src.flappy.game",
+    "src.snake.game",
+    "src.flappy.env",
+    "src.snake.env",
+    "src.flappy.app.train_agent",
+    "src.snake.app.train_agent",
+    "src.flappy.app.run_gym_env",
+    "src.snake.app.run_gym_env",
+    "src.flappy.app.play_human",
+    "src.snake.app.play_human",
+)
+
+HEAVY_MODULES = ("numpy", "gymnasium", "pygame", "dotenv", "matplotlib")
+
+# Runs in the child: import the module, report import time and which heavy
+# modules were actually executed (lazy placeholders don't count).
+_PROBE = """
+import importlib, sys, time
+t = time.perf_counter()
+importlib.import_module(sys.argv[1])
+dt = time.perf_counter() - t
+loaded = [m for m in sys.argv[2:]
+          if m in sys.modules and type(sys.modules[m]).__name__ != "_LazyModule"]
+print(dt, ",".join(loaded) or "-")
+"""
+
+
+def measure(module, runs):
+    """Return (median import ms, median process ms, heavy modules loaded) or an error string."""
+    import_ms, process_ms, loaded = [], [], "-"
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-c", _PROBE, module, *HEAVY_MODULES],
+                              cwd=PROJECT_ROOT, capture_output=True, text=True)
+        elapsed = time.perf_counter() - start
+        if proc.returncode != 0:
+            last = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "failed"
+            return last
+        dt, loaded = proc.stdout.split()
+        import_ms.append(float(dt) * 1000)
+        process_ms.append(elapsed * 1000)
+    return statistics.median(import_ms), statistics.median(process_ms), loaded
+
+
+@benchmark("startup")
+def startup(steps):
+    """Median import and whole-process time per entry point."""
+    runs = max(3, min(15, steps // 2000))
+    rows = []
+    for module in ENTRY_POINTS:
+        result = measure(module, runs)
+        if isinstance(result, str):
+            rows.append([module, "n/a", "n/a", result])
+        else:
+            rows.append([module, *result])
+    baseline = measure("os", runs)
+    rows.append(["(bare interpreter)", *baseline])
+    print_table(f"startup: median of {runs} fresh processes",
+                ["entry point", "import ms", "process ms", "heavy deps loaded"], rows)
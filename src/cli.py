@@ -0,0 +1,318 @@
+"""
+Unified command line for all games.
+
+    python -m src list
+    python -m src run flappy --agent heuristic --episodes 100
+    python -m src run snake --episodes 1000 --num-envs 16 --workers 4 --seed 0 --set cols=50 --set rows=50
+    python -m src play snake
+    python -m src run snake --episodes 100000 --num-envs 8 --spectate   # then: python -m src spectate
+    python -m src sweep src/snake/configs/sweep_example.json --workers 8
+    python -m src run snake --episodes 1000 --num-envs 8 --workers 4 --inference-server --max-batch-size 32
+    python -m src run snake --episodes 100000 --num-envs 16 --workers 4 --dataset data/snake --quiet
+    python -m src serve flappy --tick-hz 60   # agents connect with src.client.GameClient
+    python -m src eval flappy --agent heuristic --episodes 1000 --seed 0   # cached per episode
+
+Defaults for --agent, --episodes, --render and --metrics-dir come from the
+AGENT, NUM_EPISODES, RENDER and METRICS_DIR environment variables (or .env).
+"""
+import argparse
+import os
+import sys
+
+from src.registry import GAMES, get_game, load, make_config, parse_overrides
+
+DEFAULT_SPECTATE_PORT = 5555  # same as src.common.spectate.DEFAULT_PORT; not imported to keep startup light
+DEFAULT_SERVE_PORT = 7777  # same as src.server.DEFAULT_PORT
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m src", description="Run games and agents")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("list", help="List registered games and agents")
+
+    play = sub.add_parser("play", help="Play a game with the keyboard")
+    play.add_argument("game", choices=sorted(GAMES))
+
+    run = sub.add_parser("run", help="Run an agent for a number of episodes")
+    add_run_arguments(run)
+
+    spectate = sub.add_parser("spectate", help="Watch games published by `run --spectate`")
+    spectate.add_argument("address", nargs="?", default=f":{DEFAULT_SPECTATE_PORT}",
+                          help="HOST:PORT to listen on")
+    spectate.add_argument("--stream", type=int, default=None,
+                          help="Stream to show first (worker * num_envs + env); TAB cycles")
+    spectate.add_argument("--fps", type=int, default=60, help="Viewer frame rate")
+
+    sweep = sub.add_parser("sweep", help="Hyperparameter sweep with successive halving")
+    sweep.add_argument("sweep_file", help="JSON sweep definition (see src/sweep.py)")
+    sweep.add_argument("--out", default=None,
+                       help="Output/cache directory (default: runs/sweeps/<sweep file name>)")
+    sweep.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                       help="Trials run in parallel")
+
+    serve = sub.add_parser("serve", help="Host games for agents in other processes (see src/server.py)")
+    serve.add_argument("game", choices=sorted(GAMES))
+    serve.add_argument("--address", default=f":{DEFAULT_SERVE_PORT}", help="HOST:PORT to listen on")
+    serve.add_argument("--tick-hz", type=float, default=0,
+                       help="Fixed tick rate; 0 steps as soon as actions arrive")
+    serve.add_argument("--set", dest="overrides", action="append", default=[], metavar="KEY=VALUE",
+                       help="Override a game config field (repeatable)")
+    serve.add_argument("--report-interval", type=float, default=5.0,
+                       help="Seconds between throughput/latency reports (0 disables)")
+    serve.add_argument("--verbose", action="store_true", help="Report latency of each client as it leaves")
+
+    evaluate = sub.add_parser("eval", help="Evaluate a deterministic agent on fixed seeds, with a result cache")
+    evaluate.add_argument("game", choices=sorted(GAMES))
+    evaluate.add_argument("--agent", default=os.environ.get("AGENT", "random"),
+                          help="Registered agent name (see `list`)")
+    evaluate.add_argument("--episodes", type=int, default=100, help="Episodes, seeded seed, seed+1, ...")
+    evaluate.add_argument("--seed", type=int, default=0, help="Seed of the first episode")
+    evaluate.add_argument("--workers", type=int, default=1, help="Worker processes for uncached episodes")
+    evaluate.add_argument("--frame-skip", type=int, default=1, help="Repeat each action this many steps")
+    evaluate.add_argument("--agent-param", dest="agent_params", action="append", default=[],
+                          metavar="KEY=VALUE", help="Keyword argument for the agent constructor (repeatable)")
+    evaluate.add_argument("--set", dest="overrides", action="append", default=[], metavar="KEY=VALUE",
+                          help="Override a game config field (repeatable)")
+    evaluate.add_argument("--cache", default=os.path.join("runs", "cache", "eval.sqlite3"),
+                          help="Result cache file")
+    evaluate.add_argument("--cache-size-mb", type=float, default=64,
+                          help="Least recently used results are evicted beyond this size")
+    evaluate.add_argument("--no-cache", action="store_true",
+                          help="Simulate every episode (for agents that aren't deterministic)")
+    evaluate.add_argument("--results", default=None, help="Write one CSV row per episode to this path")
+    evaluate.add_argument("--quiet", action="store_true", help="Only print the summary")
+    return parser
+
+
+def add_run_arguments(parser):
+    from src.runner import VEC_MODES
+
+    parser.add_argument("game", choices=sorted(GAMES))
+    parser.add_argument("--agent", default=os.environ.get("AGENT", "random"),
+                        help="Registered agent name (see `list`)")
+    parser.add_argument("--episodes", type=int, default=int(os.environ.get("NUM_EPISODES", 5)),
+                        help="Number of episodes to run (total across workers)")
+    parser.add_argument("--num-envs", type=int, default=1,
+                        help="Envs stepped together in each worker")
+    parser.add_argument("--vec", choices=VEC_MODES, default="sync",
+                        help="Vector env type when --num-envs > 1 (async uses subprocesses)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes; episodes are split between them")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Base seed; each worker/env gets seed + offset")
+    parser.add_argument("--frame-skip", type=int, default=1,
+                        help="Repeat each action this many steps")
+    parser.add_argument("--agent-param", dest="agent_params", action="append", default=[],
+                        metavar="KEY=VALUE", help="Keyword argument for the agent constructor (repeatable)")
+    parser.add_argument("--set", dest="overrides", action="append", default=[], metavar="KEY=VALUE",
+                        help="Override a game config field, e.g. --set cols=50 (repeatable)")
+    parser.add_argument("--render", action="store_true", default=os.environ.get("RENDER") == "1",
+                        help="Render the environment (single env and worker only)")
+    parser.add_argument("--metrics-dir", default=os.environ.get("METRICS_DIR"),
+                        help="Write per-step/per-episode metrics shards to this directory")
+    parser.add_argument("--no-step-metrics", action="store_true",
+                        help="Only record per-episode metrics")
+    parser.add_argument("--dataset", default=None, metavar="DIR",
+                        help="Export every finished episode as trajectory shards for offline RL")
+    parser.add_argument("--dataset-compress", action="store_true",
+                        help="Write compressed .npz shards (smaller, not memory-mappable)")
+    parser.add_argument("--results", default=None,
+                        help="Write one CSV row per episode to this path")
+    parser.add_argument("--spectate", nargs="?", const=f":{DEFAULT_SPECTATE_PORT}", default=None,
+                        metavar="HOST:PORT", help="Publish game snapshots for `python -m src spectate`")
+    parser.add_argument("--spectate-envs", type=int, default=1,
+                        help="How many envs per worker to publish with --spectate")
+    parser.add_argument("--inference-server", action="store_true",
+                        help="Run the agent in one inference server process shared by all workers")
+    parser.add_argument("--max-batch-size", type=int, default=64,
+                        help="Most observations per inference batch (with --inference-server)")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0,
+                        help="How long the inference server waits to fill a batch")
+    parser.add_argument("--quiet", action="store_true", help="Only print the summary")
+
+
+def cmd_list(args):
+    for name, spec in GAMES.items():
+        config_cls = load(spec.config)
+        print(f"{name}")
+        print(f"  agents: {', '.join(spec.agents)}")
+        print(f"  config: {', '.join(f'{k}={v}' for k, v in config_cls()._asdict().items())}")
+
+
+def cmd_play(args):
+    load(get_game(args.game).play)()
+
+
+def cmd_run(args, parser):
+    from src.runner import RunSpec, run
+
+    if args.render and (args.num_envs > 1 or args.workers > 1):
+        parser.error("--render needs --num-envs 1 and --workers 1")
+    if args.num_envs < 1 or args.workers < 1 or args.episodes < 0:
+        parser.error("--num-envs and --workers must be >= 1, --episodes >= 0")
+    try:
+        get_game(args.game).agents[args.agent]
+    except KeyError:
+        parser.error(f"Unknown agent for {args.game}: {args.agent} "
+                     f"(choose from {', '.join(get_game(args.game).agents)})")
+    if args.inference_server or (args.num_envs > 1 and args.vec == "async"):
+        from src.registry import get_agent_class
+        if get_agent_class(args.game, args.agent).needs_game:
+            parser.error(f"The {args.agent} agent plans with the game state, which --inference-server "
+                         f"and --vec async keep in other processes; use a single env or --vec sync")
+    try:
+        config = make_config(args.game, parse_overrides(args.overrides))
+        agent_params = parse_overrides(args.agent_params)
+    except (TypeError, ValueError) as exc:
+        parser.error(str(exc))
+
+    spectate = None
+    if args.spectate:
+        from src.common.spectate import parse_address
+        spectate = parse_address(args.spectate, DEFAULT_SPECTATE_PORT)
+
+    spec = RunSpec(
+        game=args.game, agent=args.agent, config=config, episodes=args.episodes,
+        num_envs=args.num_envs, vec=args.vec, seed=args.seed, frame_skip=args.frame_skip,
+        render=args.render, metrics_dir=args.metrics_dir, log_steps=not args.no_step_metrics,
+        agent_params=agent_params, spectate=spectate, spectate_envs=args.spectate_envs,
+        dataset_dir=args.dataset, dataset_compress=args.dataset_compress,
+    )
+
+    inference = None
+    if args.inference_server:
+        if args.max_batch_size < 1 or args.max_wait_ms < 0:
+            parser.error("--max-batch-size must be >= 1 and --max-wait-ms >= 0")
+        inference = {"max_batch_size": args.max_batch_size, "max_wait": args.max_wait_ms / 1000,
+                     "metrics_dir": args.metrics_dir}
+
+    def report(r):
+        print(f"Episode {r.episode+1} (worker {r.worker}, env {r.env}): "
+              f"steps={r.steps}, total_reward={r.total_reward:.2f}, score={r.score}")
+
+    results, elapsed = run(spec, workers=args.workers, on_episode=None if args.quiet else report,
+                           inference=inference)
+    if args.results:
+        write_results(args.results, results)
+    print_summary(results, elapsed)
+
+
+def cmd_spectate(args):
+    from src.common.spectate import parse_address, run_viewer
+    run_viewer(parse_address(args.address, DEFAULT_SPECTATE_PORT), stream=args.stream, fps=args.fps)
+
+
+def cmd_sweep(args, parser):
+    from src.sweep import load_sweep, run_sweep
+
+    try:
+        sweep = load_sweep(args.sweep_file)
+    except (OSError, ValueError) as exc:
+        parser.error(str(exc))
+    out_dir = args.out or os.path.join(
+        "runs", "sweeps", os.path.splitext(os.path.basename(args.sweep_file))[0])
+    leaderboard = run_sweep(sweep, out_dir, workers=args.workers)
+    if leaderboard:
+        best, value, episodes = leaderboard[0]
+        print(f"best trial {best.trial_id}: {sweep['metric']}={value:.3f} over {episodes} episodes "
+              f"{best.params}")
+    print(f"leaderboard: {os.path.join(out_dir, 'leaderboard.json')}")
+
+
+def cmd_serve(args, parser):
+    from src.common.spectate import parse_address
+    from src.server import serve
+
+    try:
+        config = make_config(args.game, parse_overrides(args.overrides))
+    except (TypeError, ValueError) as exc:
+        parser.error(str(exc))
+    serve(args.game, config, parse_address(args.address, DEFAULT_SERVE_PORT), tick_hz=args.tick_hz,
+          report_interval=args.report_interval, verbose=args.verbose)
+
+
+def cmd_eval(args, parser):
+    import time
+    from src.evaluate import EvalCache, evaluate
+
+    if args.workers < 1 or args.episodes < 0 or args.cache_size_mb <= 0:
+        parser.error("--workers must be >= 1, --episodes >= 0 and --cache-size-mb > 0")
+    try:
+        config = make_config(args.game, parse_overrides(args.overrides))
+        agent_params = parse_overrides(args.agent_params)
+    except (TypeError, ValueError) as exc:
+        parser.error(str(exc))
+
+    def report(r):
+        print(f"Episode {r.episode+1} (seed {args.seed + r.episode}): "
+              f"steps={r.steps}, total_reward={r.total_reward:.2f}, score={r.score}")
+
+    cache = None if args.no_cache else EvalCache(args.cache, int(args.cache_size_mb * 1024 * 1024))
+    start = time.perf_counter()
+    try:
+        results, hits = evaluate(args.game, args.agent, agent_params, config, episodes=args.episodes,
+                                 seed=args.seed, frame_skip=args.frame_skip, cache=cache,
+                                 workers=args.workers, on_episode=None if args.quiet else report)
+    except ValueError as exc:
+        parser.error(str(exc))
+    finally:
+        if cache is not None:
+            cache.close()
+    elapsed = time.perf_counter() - start
+    if args.results:
+        write_results(args.results, results)
+    print_summary(results, elapsed)
+    print(f"cache: {hits} hits, {len(results) - hits} simulated")
+
+
+def write_results(path, results):
+    import csv
+    from src.runner import EpisodeResult
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(EpisodeResult._fields)
+        writer.writerows(results)
+
+
+def print_summary(results, elapsed):
+    if not results:
+        print("No episodes run")
+        return
+    steps = sum(r.steps for r in results)
+    scores = [r.score for r in results]
+    rewards = [r.total_reward for r in results]
+    print(f"{len(results)} episodes, {steps} agent steps in {elapsed:.2f}s "
+          f"({steps / elapsed:,.0f} steps/s); "
+          f"score mean={sum(scores) / len(scores):.2f} max={max(scores)}; "
+          f"reward mean={sum(rewards) / len(rewards):.2f}")
+
+
+def main(argv=None):
+    from src.common.settings import load_env_file
+    load_env_file()
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "list":
+        cmd_list(args)
+    elif args.command == "play":
+        cmd_play(args)
+    elif args.command == "run":
+        cmd_run(args, parser)
+    elif args.command == "spectate":
+        cmd_spectate(args)
+    elif args.command == "sweep":
+        cmd_sweep(args, parser)
+    elif args.command == "serve":
+        cmd_serve(args, parser)
+    elif args.command == "eval":
+        cmd_eval(args, parser)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+Clients for src.server: drive a remotely hosted game like a gym env.
+
+    with GameClient(("127.0.0.1", 7777), seed=0) as client:
+        obs, info = client.reset()
+        obs, reward, terminated, truncated, info = client.step(1)
+
+GameClient uses a blocking socket (one agent per process or thread);
+AsyncGameClient is the asyncio equivalent for running many agents in one
+event loop. Both record the round-trip time of every step in `rtts`.
+"""
+import asyncio
+import socket
+import struct
+import time
+from collections import deque
+
+from src.common.lazy import lazy_import
+from src.server import (DEFAULT_HOST, DEFAULT_PORT, ENC_FLOAT32, HELLO, MAGIC, REPLY, RESET,
+                        TERMINATED, TRUNCATED, VERSION, WELCOME, obs_size)
+
+np = lazy_import("numpy")
+
+RTT_SAMPLES = 1024
+
+
+class _Protocol:
+    """Session state and message decoding shared by both clients."""
+
+    def _hello(self, seed):
+        return HELLO.pack(MAGIC, VERSION, 0, -1 if seed is None else seed)
+
+    def _welcome(self, data):
+        magic, version, self.kind, self.encoding, self.n_actions, rank, self.session_id = WELCOME.unpack(data)
+        if magic != MAGIC or version != VERSION:
+            raise ConnectionError("Not a game server (or an incompatible version)")
+        return rank
+
+    def _dims(self, data):
+        self.obs_shape = struct.unpack(f"<{len(data) // 2}H", data)
+        self.obs_count = int(np.prod(self.obs_shape))
+        self.reply_size = REPLY.size + obs_size(self.encoding, self.obs_shape)
+        self.rtts = deque(maxlen=RTT_SAMPLES)
+
+    def _decode(self, data):
+        reward, flags, score = REPLY.unpack_from(data)
+        payload = np.frombuffer(data, dtype=np.uint8, offset=REPLY.size)
+        if self.encoding == ENC_FLOAT32:
+            obs = payload.view("<f4").astype(np.float32)
+        else:
+            obs = np.unpackbits(payload, count=self.obs_count).astype(np.float32)
+        obs = obs.reshape(self.obs_shape)
+        return obs, reward, bool(flags & TERMINATED), bool(flags & TRUNCATED), {"score": score}
+
+    def _action(self, action):
+        action = int(action)
+        if not 0 <= action < self.n_actions:
+            raise ValueError(f"Action must be in [0, {self.n_actions}), got {action}")
+        return bytes((action,))
+
+
+class GameClient(_Protocol):
+    """Blocking client; `obs`/`info` hold the state sent on connect."""
+
+    def __init__(self, address=(DEFAULT_HOST, DEFAULT_PORT), seed=None, timeout=None):
+        self.sock = socket.create_connection(address, timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock.sendall(self._hello(seed))
+        rank = self._welcome(self._recv(WELCOME.size))
+        self._dims(self._recv(2 * rank))
+        self.obs, _, _, _, self.info = self._decode(self._recv(self.reply_size))
+
+    def _recv(self, n):
+        buf = bytearray(n)
+        view = memoryview(buf)
+        while view:
+            got = self.sock.recv_into(view)
+            if not got:
+                raise ConnectionError("Server closed the connection")
+            view = view[got:]
+        return bytes(buf)
+
+    def _request(self, message):
+        start = time.perf_counter()
+        self.sock.sendall(message)
+        reply = self._decode(self._recv(self.reply_size))
+        self.rtts.append(time.perf_counter() - start)
+        return reply
+
+    def reset(self):
+        obs, _, _, _, info = self._request(bytes((RESET,)))
+        return obs, info
+
+    def step(self, action):
+        return self._request(self._action(action))
+
+    def close(self):
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncGameClient(_Protocol):
+    """asyncio client; create with `await AsyncGameClient.connect(...)`."""
+
+    @classmethod
+    async def connect(cls, address=(DEFAULT_HOST, DEFAULT_PORT), seed=None):
+        self = cls()
+        self.reader, self.writer = await asyncio.open_connection(*address)
+        self.writer.get_extra_info("socket").setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.writer.write(self._hello(seed))
+        rank = self._welcome(await self.reader.readexactly(WELCOME.size))
+        self._dims(await self.reader.readexactly(2 * rank))
+        self.obs, _, _, _, self.info = self._decode(await self.reader.readexactly(self.reply_size))
+        return self
+
+    async def _request(self, message):
+        start = time.perf_counter()
+        self.writer.write(message)
+        reply = self._decode(await self.reader.readexactly(self.reply_size))
+        self.rtts.append(time.perf_counter() - start)
+        return reply
+
+    async def reset(self):
+        obs, _, _, _, info = await self._request(bytes((RESET,)))
+        return obs, info
+
+    async def step(self, action):
+        return await self._request(self._action(action))
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
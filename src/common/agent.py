@@ -5,6 +5,15 @@ class Agent(ABC):
     Abstract base class for all agents in any game.
     Agents must implement select_action and learn methods.
     """
+    # True for agents that read the game state through attach(); they can't
+    # run where the envs live in other processes (async vector envs, the
+    # inference server).
+    needs_game = False
+    # True for agents whose actions depend only on the observations, their
+    # constructor arguments (including a `seed`, if they take one) and the
+    # seeded action space; `python -m src eval` only caches results of these.
+    deterministic = False
+
     def __init__(self, action_space):
         self.action_space = action_space
 
@@ -13,6 +22,16 @@ class Agent(ABC):
         """Given an observation, select an action."""
         pass
 
+    def select_actions(self, obs_batch):
+        """Select one action per observation in a batch (e.g. from a vector env).
+        Override with a vectorized implementation where the agent supports it."""
+        return [self.select_action(obs) for obs in obs_batch]
+
+    def attach(self, envs):
+        """Optional: receive the envs being played (one per observation in a batch)
+        before the first step, for agents that plan with the game state."""
+        pass
+
     @abstractmethod
     def learn(self, *args, **kwargs):
         """Optional: update agent based on experience (can be a no-op)."""
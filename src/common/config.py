@@ -0,0 +1,22 @@
+"""
+Field type checks shared by the game config named tuples.
+"""
+import numbers
+
+
+def check_field_types(config, integers=(), optional=()):
+    """
+    Raise TypeError naming the first field of config with the wrong type.
+
+    Every field must be a number (bools excluded); fields in `integers` must
+    be whole numbers, and fields in `optional` may also be None.
+    """
+    for name, value in zip(config._fields, config):
+        if value is None and name in optional:
+            continue
+        kind = numbers.Integral if name in integers else numbers.Real
+        if isinstance(value, bool) or not isinstance(value, kind):
+            expected = "an integer" if name in integers else "a number"
+            if name in optional:
+                expected += " or None"
+            raise TypeError(f"{type(config).__name__}.{name} must be {expected}, got {value!r}")
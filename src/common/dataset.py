@@ -0,0 +1,364 @@
+"""
+Trajectory datasets for offline RL: shards written during runs, streamed back as minibatches.
+
+TrajectoryWriter collects transitions per env and appends each finished
+episode (or segment, see below) to the current shard. Shards end on segment
+boundaries once they hold at least shard_steps steps, and a background thread writes them as
+either
+
+  - a directory of .npy files (default), which the loader memory-maps, or
+  - a compressed .npz (compress=True): smaller on disk, but decompressed
+    one whole shard at a time when read.
+
+Binary observations (Snake's 0/1 grid) are bit-packed in both formats,
+32x smaller than float32. Shard contents:
+
+    obs         (steps, ...)  observation before each action (encoded)
+    actions     (steps,)
+    rewards     (steps,)      float32
+    terminated  (steps,)      bool, only ever set on an episode's last step
+    truncated   (steps,)      bool, likewise
+    episodes    (n, 2)        int64 start step and length of each segment
+    final_obs   (n, ...)      observation after each segment's last step (encoded)
+    meta.json                 obs shape/dtype/encoding, step/episode/segment counts,
+                              incomplete episode and step counts
+
+A segment is a run of consecutive steps of one episode. Episodes of up to
+segment_steps steps are a single segment; longer ones are written as
+consecutive segments of at most segment_steps steps, so memory per env
+stays bounded however long an episode runs. Every segment but an episode's
+last has neither flag set, and its final_obs is the obs the next segment
+starts from. The last segment of every complete episode has terminated or
+truncated set. An episode that is discarded or still running when the
+writer is closed is dropped if none of it was written yet; otherwise its
+remaining steps are written as a last segment with neither flag set, and
+the episode is counted in the meta of that shard as incomplete (with all
+of its steps) rather than as an episode.
+
+The next observation of a step is the obs of the following step, or the
+segment's final_obs for its last step, so observations are stored once.
+
+iter_minibatches() streams a dataset: it visits shards in random order a
+few at a time and yields shuffled minibatches gathered from them, so memory
+use is bounded by shards_in_memory instead of the dataset size.
+"""
+import glob
+import json
+import os
+import queue
+import shutil
+import threading
+
+import numpy as np
+
+OBS_ENCODINGS = ("raw", "bits")
+GAME_OBS_ENCODING = {"flappy": "raw", "snake": "bits"}
+SHARD_PREFIX = "shard"
+_ARRAYS = ("obs", "actions", "rewards", "terminated", "truncated", "episodes", "final_obs")
+
+
+def encode_obs(obs, encoding):
+    """Encode a batch of observations (n, ...) for storage."""
+    if encoding == "bits":
+        return np.packbits(obs.reshape(len(obs), -1) > 0.5, axis=1)
+    return obs
+
+
+def decode_obs(data, encoding, shape, dtype):
+    """Inverse of encode_obs for a batch of stored rows."""
+    if encoding == "bits":
+        count = int(np.prod(shape))
+        return np.unpackbits(data, axis=1, count=count).astype(dtype).reshape((len(data),) + tuple(shape))
+    return np.asarray(data, dtype=dtype)
+
+
+class TrajectoryWriter:
+    """
+    Segment-aligned shard writer for transitions from num_envs envs.
+
+    Args:
+        out_dir: dataset directory (created if missing)
+        obs_shape, obs_dtype: observation layout
+        encoding: "raw" or "bits" (for observations that are all 0/1)
+        action_dtype: stored action type
+        num_envs: envs whose transitions are interleaved through add()
+        shard_steps: steps per shard (a shard may run over to finish an episode)
+        segment_steps: longest piece of an episode buffered before it is written
+        compress: write compressed .npz shards instead of .npy directories
+        name: shard name prefix; use distinct names for concurrent writers
+    """
+
+    def __init__(self, out_dir, obs_shape, obs_dtype="float32", encoding="raw", action_dtype="int64",
+                 num_envs=1, shard_steps=100_000, segment_steps=10_000, compress=False, name=SHARD_PREFIX):
+        if encoding not in OBS_ENCODINGS:
+            raise ValueError(f"Unknown observation encoding: {encoding}")
+        self.out_dir = out_dir
+        self.obs_shape = tuple(obs_shape)
+        self.obs_dtype = np.dtype(obs_dtype)
+        self.encoding = encoding
+        self.action_dtype = np.dtype(action_dtype)
+        self.shard_steps = shard_steps
+        self.segment_steps = max(1, segment_steps)
+        self.compress = compress
+        self.name = name
+        self.steps = 0
+        self.episodes = 0
+        os.makedirs(out_dir, exist_ok=True)
+
+        # Continue numbering after any shards left by a previous run
+        existing = _shard_paths(out_dir, name)
+        self._next_shard = _shard_index(existing[-1]) + 1 if existing else 0
+
+        self._open = [([], [], []) for _ in range(num_envs)]  # per env: obs, actions, rewards
+        self._continued = [False] * num_envs  # per env: earlier segments of the open episode written
+        self._last_obs = [None] * num_envs  # per env: next_obs of the latest transition
+        self._written = [0] * num_envs  # per env: steps of the open episode already written
+        self._chunk = {key: [] for key in _ARRAYS}
+        self._chunk_steps = 0
+        self._chunk_incomplete = [0, 0]  # episodes ended by discard() or close(), and their steps
+
+        # Bounded queue: if the disk can't keep up, add() waits instead of buffering without limit
+        self._pending = queue.Queue(maxsize=2)
+        self._error = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=f"dataset-{name}", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def for_spaces(cls, out_dir, observation_space, action_space, **kwargs):
+        """Writer for a gym env's spaces; Discrete actions are stored in the smallest integer type."""
+        n = getattr(action_space, "n", None)
+        if n is not None:
+            kwargs.setdefault("action_dtype", np.min_scalar_type(int(n) - 1))
+        return cls(out_dir, observation_space.shape, observation_space.dtype, **kwargs)
+
+    def add(self, env, obs, action, reward, terminated, truncated, next_obs):
+        """Record one transition of env."""
+        if len(self._open[env][0]) >= self.segment_steps:
+            # The episode continues past a full segment: write it, ending at this obs
+            self._finish(env, False, False, obs, episode_end=False)
+            self._continued[env] = True
+        obs_list, actions, rewards = self._open[env]
+        obs_list.append(obs)
+        actions.append(action)
+        rewards.append(reward)
+        self._last_obs[env] = next_obs
+        if terminated or truncated:
+            self._finish(env, bool(terminated), bool(truncated), next_obs)
+
+    def discard(self, env):
+        """
+        Drop env's unfinished episode, e.g. one the run won't count. If
+        segments of it were already written, its remaining steps are written
+        too and it is counted as incomplete.
+        """
+        if self._continued[env]:
+            self._chunk_incomplete[0] += 1
+            self._chunk_incomplete[1] += self._written[env] + len(self._open[env][0])
+            self._finish(env, False, False, self._last_obs[env], episode_end=False)
+        self._open[env] = ([], [], [])
+        self._continued[env] = False
+        self._last_obs[env] = None
+        self._written[env] = 0
+
+    def _finish(self, env, terminated, truncated, final_obs, episode_end=True):
+        obs_list, actions, rewards = self._open[env]
+        self._open[env] = ([], [], [])
+        n = len(obs_list)
+        chunk = self._chunk
+        chunk["obs"].append(encode_obs(np.asarray(obs_list, dtype=self.obs_dtype), self.encoding))
+        chunk["actions"].append(np.asarray(actions, dtype=self.action_dtype))
+        chunk["rewards"].append(np.asarray(rewards, dtype=np.float32))
+        flags = np.zeros((2, n), dtype=bool)
+        flags[0, -1] = terminated
+        flags[1, -1] = truncated
+        chunk["terminated"].append(flags[0])
+        chunk["truncated"].append(flags[1])
+        chunk["episodes"].append(np.array([[self._chunk_steps, n]], dtype=np.int64))
+        chunk["final_obs"].append(encode_obs(np.asarray([final_obs], dtype=self.obs_dtype), self.encoding))
+        self._chunk_steps += n
+        self.steps += n
+        self._written[env] += n
+        if episode_end:
+            self.episodes += 1
+            self._continued[env] = False
+            self._last_obs[env] = None
+            self._written[env] = 0
+        if self._chunk_steps >= self.shard_steps:
+            self._submit()
+
+    def _submit(self):
+        if not self._chunk_steps:
+            return
+        if self._error is not None:
+            raise self._error
+        arrays = {key: np.concatenate(parts) for key, parts in self._chunk.items()}
+        self._pending.put((self._next_shard, arrays, tuple(self._chunk_incomplete)))
+        self._next_shard += 1
+        self._chunk = {key: [] for key in _ARRAYS}
+        self._chunk_steps = 0
+        self._chunk_incomplete = [0, 0]
+
+    def close(self):
+        """
+        Write finished episodes still buffered. Unfinished episodes are
+        discarded (see discard()).
+        """
+        if self._closed:
+            return
+        self._closed = True
+        for env in range(len(self._open)):
+            self.discard(env)
+        self._submit()
+        self._pending.put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _run(self):
+        while True:
+            item = self._pending.get()
+            if item is None:
+                return
+            try:
+                self._write_shard(*item)
+            except Exception as exc:  # surfaced on the next submit/close
+                self._error = exc
+
+    def _write_shard(self, index, arrays, incomplete):
+        meta = {
+            "steps": int(len(arrays["actions"])),
+            "episodes": int(np.count_nonzero(arrays["terminated"] | arrays["truncated"])),
+            "segments": int(len(arrays["episodes"])),
+            "incomplete_episodes": incomplete[0],
+            "incomplete_steps": incomplete[1],
+            "obs_shape": list(self.obs_shape),
+            "obs_dtype": self.obs_dtype.str,
+            "encoding": self.encoding,
+        }
+        path = os.path.join(self.out_dir, f"{self.name}-{index:06d}")
+        if self.compress:
+            tmp = path + ".tmp.npz"
+            np.savez_compressed(tmp, meta=np.array(json.dumps(meta)), **arrays)
+            os.replace(tmp, path + ".npz")
+            return
+        tmp = path + ".tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        for key, value in arrays.items():
+            np.save(os.path.join(tmp, f"{key}.npy"), value)
+        with open(os.path.join(tmp, "meta.json"), "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, path)  # the shard appears complete or not at all
+
+
+def _shard_paths(path, name="*"):
+    paths = [p for p in glob.glob(os.path.join(path, f"{name}-[0-9]*"))
+             if not p.endswith((".tmp", ".tmp.npz"))]
+    return sorted(paths, key=lambda p: (os.path.basename(p).rsplit("-", 1)[0], _shard_index(p)))
+
+
+def _shard_index(path):
+    return int(os.path.basename(path).rsplit("-", 1)[1].split(".", 1)[0])
+
+
+class Shard:
+    """One stored shard; .npy directories are memory-mapped, .npz files loaded whole."""
+
+    def __init__(self, path):
+        self.path = path
+        if path.endswith(".npz"):
+            with np.load(path) as data:
+                self.meta = json.loads(str(data["meta"]))
+                self.arrays = {key: data[key] for key in _ARRAYS}
+        else:
+            with open(os.path.join(path, "meta.json")) as f:
+                self.meta = json.load(f)
+            self.arrays = {key: np.load(os.path.join(path, f"{key}.npy"), mmap_mode="r") for key in _ARRAYS}
+        self.steps = self.meta["steps"]
+        self.obs_shape = tuple(self.meta["obs_shape"])
+        self.obs_dtype = np.dtype(self.meta["obs_dtype"])
+        self.encoding = self.meta["encoding"]
+        episodes = np.asarray(self.arrays["episodes"])
+        self._starts = episodes[:, 0]
+        self._ends = episodes[:, 0] + episodes[:, 1] - 1
+
+    def gather(self, index):
+        """Decoded transitions at the given (sorted) step indices."""
+        a = self.arrays
+        episode = np.searchsorted(self._starts, index, side="right") - 1
+        last = index == self._ends[episode]
+        next_obs = np.array(a["obs"][np.minimum(index + 1, self.steps - 1)])
+        if last.any():
+            next_obs[last] = a["final_obs"][episode[last]]
+        decode = lambda rows: decode_obs(rows, self.encoding, self.obs_shape, self.obs_dtype)  # noqa: E731
+        return {
+            "obs": decode(a["obs"][index]),
+            "actions": np.asarray(a["actions"][index]),
+            "rewards": np.asarray(a["rewards"][index]),
+            "terminated": np.asarray(a["terminated"][index]),
+            "truncated": np.asarray(a["truncated"][index]),
+            "next_obs": decode(next_obs),
+        }
+
+
+def list_shards(path):
+    """All finished shards under a dataset directory."""
+    return _shard_paths(path)
+
+
+def dataset_info(path):
+    """
+    Totals over a dataset's shards: shards, steps and episodes of complete
+    episodes, incomplete episodes and their steps, and bytes on disk.
+    """
+    info = {"shards": 0, "steps": 0, "episodes": 0, "incomplete_episodes": 0, "incomplete_steps": 0, "bytes": 0}
+    for shard_path in list_shards(path):
+        shard = Shard(shard_path)
+        info["shards"] += 1
+        info["steps"] += shard.steps
+        info["episodes"] += shard.meta["episodes"]
+        info["incomplete_episodes"] += shard.meta.get("incomplete_episodes", 0)
+        info["incomplete_steps"] += shard.meta.get("incomplete_steps", 0)
+        if os.path.isdir(shard_path):
+            info["bytes"] += sum(os.path.getsize(p) for p in glob.glob(os.path.join(shard_path, "*")))
+        else:
+            info["bytes"] += os.path.getsize(shard_path)
+    info["steps"] -= info["incomplete_steps"]  # an incomplete episode's steps can span shards
+    return info
+
+
+def iter_minibatches(path, batch_size=256, shuffle=True, seed=None, shards_in_memory=4, drop_last=False):
+    """
+    Yield minibatch dicts (obs, actions, rewards, terminated, truncated,
+    next_obs) over one pass of the dataset at path.
+
+    Shards are visited in random order, shards_in_memory at a time; each
+    minibatch samples without replacement from the open shards.
+    """
+    paths = list_shards(path)
+    if not paths:
+        raise FileNotFoundError(f"No dataset shards in {path}")
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(len(paths)) if shuffle else np.arange(len(paths))
+    for g in range(0, len(order), shards_in_memory):
+        shards = [Shard(paths[i]) for i in order[g:g + shards_in_memory]]
+        offsets = np.cumsum([0] + [s.steps for s in shards])
+        total = int(offsets[-1])
+        perm = rng.permutation(total) if shuffle else np.arange(total)
+        for b in range(0, total, batch_size):
+            picked = np.sort(perm[b:b + batch_size])
+            if drop_last and len(picked) < batch_size:
+                break
+            owner = np.searchsorted(offsets, picked, side="right") - 1
+            parts = [shards[s].gather(picked[owner == s] - offsets[s]) for s in np.unique(owner)]
+            if len(parts) == 1:
+                yield parts[0]
+            else:
+                yield {key: np.concatenate([p[key] for p in parts]) for key in parts[0]}
@@ -0,0 +1,25 @@
+"""
+Deferred imports for heavy optional dependencies.
+
+`np = lazy_import("numpy")` binds a module object whose real import runs on
+first attribute access, so modules that only touch NumPy (or gymnasium,
+pygame, ...) on some code paths don't pay for it at import time.
+"""
+import importlib.util
+import sys
+
+
+def lazy_import(name):
+    """Return module `name`, deferring its execution until first use."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,217 @@
+"""
+Low-overhead training metrics.
+
+MetricsWriter accumulates rows into preallocated NumPy record buffers and hands
+full buffers to a background thread that writes them out as numbered shard
+files (`<name>-000000.npy` or `.csv`). The training loop only pays for one
+record assignment per log() call; disk I/O happens off-thread.
+
+Shards are written to a temporary file and renamed into place, so readers
+(e.g. `python -m src.common.plot_metrics`) can poll the directory while
+training is running and never see a partial shard.
+"""
+import glob
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+SHARD_FORMATS = ("npy", "csv")
+
+
+class MetricsWriter:
+    """
+    Buffered, sharded writer for one stream of fixed-schema rows.
+
+    Args:
+        out_dir: directory for shard files (created if missing)
+        name: stream name, used as the shard filename prefix
+        fields: list of column names; all values are stored as float64
+        capacity: rows per shard / per preallocated buffer
+        fmt: "npy" (default) or "csv"
+        max_shards: keep only the newest N shards (None keeps all)
+    """
+
+    def __init__(self, out_dir, name, fields, capacity=4096, fmt="npy", max_shards=None):
+        if fmt not in SHARD_FORMATS:
+            raise ValueError(f"Unknown shard format: {fmt}")
+        self.out_dir = out_dir
+        self.name = name
+        self.fields = list(fields)
+        self.capacity = capacity
+        self.fmt = fmt
+        self.max_shards = max_shards
+        self._dtype = np.dtype([(f, np.float64) for f in self.fields])
+        os.makedirs(out_dir, exist_ok=True)
+
+        # Continue numbering after any shards left by a previous run
+        existing = _shard_paths(out_dir, name)
+        self._next_shard = _shard_index(existing[-1]) + 1 if existing else 0
+        self._written = list(existing)
+
+        # Two preallocated buffers: one being filled, one being written
+        self._free = queue.SimpleQueue()
+        self._free.put(np.zeros(capacity, dtype=self._dtype))
+        self._buf = np.zeros(capacity, dtype=self._dtype)
+        self._n = 0
+
+        self._pending = queue.Queue()
+        self._error = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=f"metrics-{name}", daemon=True)
+        self._thread.start()
+
+    def log(self, *values):
+        """Append one row; values are given in `fields` order."""
+        self._buf[self._n] = values
+        self._n += 1
+        if self._n == self.capacity:
+            self._swap()
+
+    def submit(self):
+        """Hand the partially filled buffer to the writer without waiting."""
+        if self._n:
+            self._swap()
+
+    def flush(self):
+        """Hand the partially filled buffer to the writer and wait for it to hit disk."""
+        self.submit()
+        self._pending.join()
+        if self._error is not None:
+            error, self._error = self._error, None  # report each failure once
+            raise error
+
+    def close(self):
+        """Flush remaining rows and stop the writer thread (also if the last write failed)."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self.flush()
+        finally:
+            self._pending.put(None)
+            self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _swap(self):
+        self._pending.put((self._buf, self._n))
+        try:
+            self._buf = self._free.get_nowait()
+        except queue.Empty:
+            # Writer is behind; grow the pool instead of blocking training
+            self._buf = np.zeros(self.capacity, dtype=self._dtype)
+        self._n = 0
+
+    def _run(self):
+        while True:
+            item = self._pending.get()
+            if item is None:
+                self._pending.task_done()
+                return
+            buf, n = item
+            try:
+                self._write_shard(buf[:n])
+            except Exception as exc:  # surfaced on the next flush()
+                self._error = exc
+            self._free.put(buf)
+            self._pending.task_done()
+
+    def _write_shard(self, rows):
+        path = os.path.join(self.out_dir, f"{self.name}-{self._next_shard:06d}.{self.fmt}")
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            if self.fmt == "npy":
+                np.save(f, rows)
+            else:
+                np.savetxt(f, rows.view(np.float64).reshape(len(rows), -1),
+                           delimiter=",", header=",".join(self.fields), comments="")
+        os.replace(tmp, path)
+        self._next_shard += 1
+        self._written.append(path)
+        if self.max_shards is not None:
+            while len(self._written) > self.max_shards:
+                old = self._written.pop(0)
+                try:
+                    os.remove(old)
+                except FileNotFoundError:
+                    pass
+
+
+class TrainingMetrics:
+    """
+    Per-step and per-episode streams for a training loop.
+
+    Step rows: episode, step, action, reward
+    Episode rows: episode, steps, total_reward, score
+
+    Full buffers are written as soon as they fill; in addition, partially
+    filled buffers are handed off at an episode boundary once flush_interval
+    seconds have passed, so live plots stay current on slow runs.
+    """
+
+    STEP_FIELDS = ("episode", "step", "action", "reward")
+    EPISODE_FIELDS = ("episode", "steps", "total_reward", "score")
+
+    def __init__(self, out_dir, log_steps=True, capacity=4096, fmt="npy", max_shards=None,
+                 flush_interval=5.0):
+        self.flush_interval = flush_interval
+        self._last_submit = time.monotonic()
+        self.steps = None
+        if log_steps:
+            self.steps = MetricsWriter(out_dir, "steps", self.STEP_FIELDS,
+                                       capacity=capacity, fmt=fmt, max_shards=max_shards)
+        self.episodes = MetricsWriter(out_dir, "episodes", self.EPISODE_FIELDS,
+                                      capacity=256, fmt=fmt, max_shards=max_shards)
+
+    def step(self, episode, step, action, reward):
+        if self.steps is not None:
+            self.steps.log(episode, step, action, reward)
+
+    def episode(self, episode, steps, total_reward, score):
+        self.episodes.log(episode, steps, total_reward, score)
+        now = time.monotonic()
+        if now - self._last_submit >= self.flush_interval:
+            self._last_submit = now
+            if self.steps is not None:
+                self.steps.submit()
+            self.episodes.submit()
+
+    def close(self):
+        if self.steps is not None:
+            self.steps.close()
+        self.episodes.close()
+
+
+def read_metrics(out_dir, name):
+    """Load and concatenate all finished shards of a stream as a record array."""
+    parts = []
+    for path in _shard_paths(out_dir, name):
+        try:
+            if path.endswith(".npy"):
+                parts.append(np.load(path))
+            else:
+                data = np.genfromtxt(path, delimiter=",", names=True, dtype=np.float64)
+                parts.append(np.atleast_1d(data))
+        except FileNotFoundError:
+            continue  # rotated away by max_shards while we were listing
+    if not parts:
+        return None
+    return np.concatenate(parts)
+
+
+def _shard_paths(out_dir, name):
+    paths = []
+    for fmt in SHARD_FORMATS:
+        paths.extend(glob.glob(os.path.join(out_dir, f"{name}-[0-9]*.{fmt}")))
+    return sorted(paths, key=_shard_index)
+
+
+def _shard_index(path):
+    return int(os.path.basename(path).rsplit("-", 1)[1].split(".", 1)[0])
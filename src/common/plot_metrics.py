@@ -0,0 +1,72 @@
+"""
+Live plot of metrics shards written by src.common.metrics.
+
+Reads the shard files only, so it can run in a separate process (or on
+another machine with the directory mounted) without touching training.
+
+Usage:
+    python -m src.common.plot_metrics runs/flappy
+    python -m src.common.plot_metrics runs/flappy --stream steps --field reward --window 1000
+"""
+import argparse
+
+import numpy as np
+
+from src.common.metrics import read_metrics
+
+
+def moving_average(values, window):
+    if window <= 1 or len(values) < window:
+        return values
+    csum = np.cumsum(np.insert(values, 0, 0.0))
+    return (csum[window:] - csum[:-window]) / window
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Live plot of training metrics shards")
+    parser.add_argument("metrics_dir", help="Directory passed as --metrics-dir to training")
+    parser.add_argument("--stream", default="episodes", help="Shard stream: episodes or steps")
+    parser.add_argument("--field", default="total_reward", help="Column to plot")
+    parser.add_argument("--window", type=int, default=20, help="Moving-average window")
+    parser.add_argument("--interval", type=float, default=2.0, help="Refresh interval in seconds")
+    parser.add_argument("--once", action="store_true", help="Draw once and exit (no live refresh)")
+    args = parser.parse_args()
+
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots()
+    raw_line, = ax.plot([], [], alpha=0.3, label=args.field)
+    avg_line, = ax.plot([], [], label=f"{args.field} (avg {args.window})")
+    ax.set_xlabel(args.stream)
+    ax.set_ylabel(args.field)
+    ax.legend(loc="upper left")
+
+    def refresh():
+        data = read_metrics(args.metrics_dir, args.stream)
+        if data is None or len(data) == 0:
+            return
+        if args.field not in data.dtype.names:
+            raise SystemExit(f"Unknown field {args.field!r}; have {', '.join(data.dtype.names)}")
+        y = data[args.field]
+        x = np.arange(len(y))
+        raw_line.set_data(x, y)
+        avg = moving_average(y, args.window)
+        avg_line.set_data(x[len(x) - len(avg):], avg)
+        ax.relim()
+        ax.autoscale_view()
+        ax.set_title(f"{args.metrics_dir}: {len(y)} {args.stream}")
+
+    refresh()
+    if args.once:
+        plt.show()
+        return
+    plt.ion()
+    plt.show()
+    while plt.fignum_exists(fig.number):
+        refresh()
+        fig.canvas.draw_idle()
+        plt.pause(args.interval)
+
+
+if __name__ == "__main__":
+    main()
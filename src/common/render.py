@@ -0,0 +1,295 @@
+"""
+Pygame renderers shared by the human play scripts and the env render() paths.
+
+Renderers draw straight from game state and only repaint what changed:
+draw() returns the dirty rectangles, which present() passes to
+pygame.display.update. Static pieces (background, pipe columns, the bird,
+snake cells, text) are pre-rendered once and blitted.
+
+FixedTickLoop runs the simulation at a fixed tick rate independent of the
+display frame rate.
+"""
+import time
+
+from src.common.lazy import lazy_import
+
+pygame = lazy_import("pygame")
+
+# Colors
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+SKY = (135, 206, 235)
+PIPE_GREEN = (76, 187, 23)
+BIRD_YELLOW = (255, 255, 0)
+SNAKE_HEAD = (0, 200, 0)
+SNAKE_BODY = (50, 150, 255)
+FOOD_RED = (200, 0, 0)
+
+
+def open_window(size, title=None):
+    """Initialise pygame and open a window of the given (w, h) size."""
+    pygame.init()
+    screen = pygame.display.set_mode(size)
+    if title:
+        pygame.display.set_caption(title)
+    return screen
+
+
+def present(rects):
+    """Push dirty rectangles to the display (no-op when nothing changed)."""
+    if rects:
+        pygame.display.update(rects)
+
+
+class TextCache:
+    """Rendered text surfaces, keyed by string; keeps the most recent `size`."""
+
+    def __init__(self, font, color, size=64):
+        self.font = font
+        self.color = color
+        self.size = size
+        self._surfaces = {}
+
+    def get(self, text):
+        surf = self._surfaces.pop(text, None)
+        if surf is None:
+            surf = self.font.render(text, True, self.color)
+            if len(self._surfaces) >= self.size:
+                self._surfaces.pop(next(iter(self._surfaces)))
+        self._surfaces[text] = surf  # re-insert as most recent
+        return surf
+
+
+class FlappyRenderer:
+    """Dirty-rect renderer for FlappyGame."""
+
+    def __init__(self, game, screen, font_size=36):
+        self.game = game
+        self.screen = screen
+        self.text = TextCache(pygame.font.SysFont(None, font_size), BLACK)
+        w, h = game.SCREEN_W, game.SCREEN_H
+        self.background = pygame.Surface((w, h)).convert()
+        self.background.fill(SKY)
+        self.pipe = pygame.Surface((game.PIPE_WIDTH, h)).convert()
+        self.pipe.fill(PIPE_GREEN)
+        r = game.BIRD_RADIUS
+        self.bird = pygame.Surface((2 * r, 2 * r), pygame.SRCALPHA).convert_alpha()
+        pygame.draw.circle(self.bird, BLACK, (r, r), r)
+        pygame.draw.circle(self.bird, BIRD_YELLOW, (r, r), r - 3)
+        self._prev_rects = []
+        self._last_ticks = None
+        self._overlay_drawn = False
+
+    def draw(self, force=False):
+        """Repaint changed regions and return them as a list of Rects."""
+        game = self.game
+        # A new episode normally shows up as ticks going back, but the spectator
+        # viewer drops frames, so also redraw once a drawn overlay is stale.
+        if (force or self._last_ticks is None or game.ticks < self._last_ticks
+                or (self._overlay_drawn and not game.done)):
+            return self._draw_full()
+        if game.ticks == self._last_ticks and (self._overlay_drawn or not game.done):
+            return []
+        self._last_ticks = game.ticks
+
+        screen, background = self.screen, self.background
+        for rect in self._prev_rects:
+            screen.blit(background, rect, rect)
+        rects = self._draw_objects()
+        dirty = self._prev_rects + rects
+        self._prev_rects = rects
+        dirty.extend(self._draw_overlay())
+        return dirty
+
+    def _draw_full(self):
+        self._last_ticks = self.game.ticks
+        self._overlay_drawn = False
+        self.screen.blit(self.background, (0, 0))
+        self._prev_rects = self._draw_objects()
+        self._draw_overlay()
+        return [self.screen.get_rect()]
+
+    def _draw_objects(self):
+        game, screen = self.game, self.screen
+        rects = []
+        for p in game.pipes:
+            if p["top_h"] > 0:
+                rects.append(screen.blit(self.pipe, (p["top_x"], 0), (0, 0, game.PIPE_WIDTH, p["top_h"])))
+            rects.append(screen.blit(self.pipe, (p["bottom_x"], p["bottom_y"]),
+                                     (0, 0, game.PIPE_WIDTH, p["bottom_h"])))
+        r = game.BIRD_RADIUS
+        rects.append(screen.blit(self.bird, (game.BIRD_X - r, int(game.bird_y) - r)))
+        rects.append(screen.blit(self.text.get(f"Score: {game.score}"), (10, 10)))
+        return rects
+
+    def _draw_overlay(self):
+        if not self.game.done or self._overlay_drawn:
+            return []
+        self._overlay_drawn = True
+        surf = self.text.get("Game Over - Press SPACE to restart")
+        rect = surf.get_rect(center=(self.game.SCREEN_W // 2, self.game.SCREEN_H // 2))
+        return [self.screen.blit(surf, rect)]
+
+
+def snake_cell_size(game, max_window=800, max_cell=20):
+    """Cell size in pixels that keeps the board window within max_window."""
+    return max(2, min(max_cell, max_window // max(game.COLS, game.ROWS)))
+
+
+class SnakeRenderer:
+    """
+    Dirty-rect renderer for SnakeGame.
+
+    Between consecutive steps only the new head, the previous head (now
+    body), the vacated tail cell and the food can change, so a normal frame
+    repaints at most four cells. Resets and skipped steps fall back to a
+    full redraw.
+    """
+
+    def __init__(self, game, screen, cell=None, font_size=32):
+        self.game = game
+        self.screen = screen
+        self.cell = cell or snake_cell_size(game)
+        self.text = TextCache(pygame.font.SysFont(None, font_size), WHITE)
+        c = self.cell
+        self.tiles = {}
+        for name, color in (("empty", BLACK), ("head", SNAKE_HEAD), ("body", SNAKE_BODY), ("food", FOOD_RED)):
+            tile = pygame.Surface((c, c)).convert()
+            tile.fill(color)
+            self.tiles[name] = tile
+        self._last_steps = None
+        self._head = None
+        self._tail = None
+        self._food = None
+        self._text_rect = None
+        self._text_surf = None
+        self._overlay_drawn = False
+
+    def draw(self, force=False):
+        """Repaint changed cells and return them as a list of Rects."""
+        game = self.game
+        if (force or self._last_steps is None or game.steps < self._last_steps
+                or game.steps > self._last_steps + 1 or not game.snake
+                or (self._overlay_drawn and not game.done)):  # new episode after dropped frames
+            return self._draw_full()
+        if game.steps == self._last_steps:
+            return self._draw_overlay()
+        self._last_steps = game.steps
+
+        dirty = []
+        head = game.snake[0]
+        if head != self._head:
+            dirty.append(self._blit_cell(self._head, "body" if self._head in game._occupied else "empty"))
+            dirty.append(self._blit_cell(head, "head"))
+        if self._tail != game.snake[-1] and self._tail not in game._occupied:
+            dirty.append(self._blit_cell(self._tail, "empty"))
+        if game.food != self._food:
+            if self._food is not None and self._food not in game._occupied:
+                dirty.append(self._blit_cell(self._food, "empty"))
+            if game.food is not None:
+                dirty.append(self._blit_cell(game.food, "food"))
+        self._remember()
+        dirty.extend(self._draw_text(dirty))
+        dirty.extend(self._draw_overlay())
+        return dirty
+
+    def _draw_full(self):
+        game = self.game
+        self._last_steps = game.steps
+        self._overlay_drawn = False
+        self.screen.fill(BLACK)
+        if game.food is not None:
+            self._blit_cell(game.food, "food")
+        for i, pos in enumerate(game.snake):
+            self._blit_cell(pos, "head" if i == 0 else "body")
+        self._remember()
+        self._text_rect = None
+        self._draw_text(None)
+        self._draw_overlay()
+        return [self.screen.get_rect()]
+
+    def _remember(self):
+        game = self.game
+        self._head = game.snake[0] if game.snake else None
+        self._tail = game.snake[-1] if game.snake else None
+        self._food = game.food
+
+    def _blit_cell(self, pos, tile):
+        c = self.cell
+        return self.screen.blit(self.tiles[tile], (pos[0] * c, pos[1] * c))
+
+    def _cells_under(self, rect):
+        """Repaint the board cells covered by rect (used to erase old text)."""
+        game, c = self.game, self.cell
+        for y in range(rect.top // c, min(game.ROWS, rect.bottom // c + 1)):
+            for x in range(rect.left // c, min(game.COLS, rect.right // c + 1)):
+                pos = (x, y)
+                if pos == game.snake[0]:
+                    tile = "head"
+                elif pos in game._occupied:
+                    tile = "body"
+                elif pos == game.food:
+                    tile = "food"
+                else:
+                    tile = "empty"
+                self._blit_cell(pos, tile)
+
+    def _draw_text(self, dirty):
+        """Redraw the score if it changed or a repainted cell overlapped it."""
+        surf = self.text.get(f"Score: {self.game.score}")
+        rect = surf.get_rect(topleft=(5, 5))
+        if (dirty is not None and self._text_rect is not None and rect == self._text_rect
+                and self._text_rect.collidelist(dirty) < 0 and self._text_surf is surf):
+            return []
+        area = rect if self._text_rect is None else rect.union(self._text_rect)
+        self._cells_under(area)
+        self.screen.blit(surf, rect)
+        self._text_rect = rect
+        self._text_surf = surf
+        return [area]
+
+    def _draw_overlay(self):
+        if not self.game.done or self._overlay_drawn:
+            return []
+        self._overlay_drawn = True
+        surf = self.text.get("Game Over - Press R to restart")
+        rect = surf.get_rect(center=(self.screen.get_width() // 2, self.screen.get_height() // 2))
+        return [self.screen.blit(surf, rect)]
+
+
+class FixedTickLoop:
+    """
+    Run update() at tick_hz and draw() at up to fps, independently.
+
+    If rendering falls behind, up to max_catchup ticks run per frame before
+    the simulation clock is allowed to slip (so a stall doesn't cause a
+    burst of hundreds of ticks).
+    """
+
+    def __init__(self, tick_hz, fps=60, max_catchup=5):
+        self.tick = 1.0 / tick_hz
+        self.fps = fps
+        self.max_catchup = max_catchup
+        self.running = True
+
+    def stop(self):
+        self.running = False
+
+    def run(self, handle_events, update, draw):
+        clock = pygame.time.Clock()
+        accumulator = 0.0
+        last = time.perf_counter()
+        while self.running:
+            now = time.perf_counter()
+            accumulator += now - last
+            last = now
+            handle_events()
+            ticks = 0
+            while accumulator >= self.tick and ticks < self.max_catchup and self.running:
+                update()
+                accumulator -= self.tick
+                ticks += 1
+            if ticks == self.max_catchup:
+                accumulator = min(accumulator, self.tick)
+            present(draw())
+            clock.tick(self.fps)
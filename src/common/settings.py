@@ -0,0 +1,22 @@
+"""
+Runtime settings from the environment and an optional `.env` file.
+"""
+import os
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def load_env_file():
+    """
+    Load `.env` from the working directory or project root, if there is one.
+
+    python-dotenv is only imported when a file exists, so short-lived
+    processes launched without a `.env` skip its import cost.
+    """
+    for directory in (os.getcwd(), PROJECT_ROOT):
+        path = os.path.join(directory, ".env")
+        if os.path.isfile(path):
+            from dotenv import load_dotenv
+            load_dotenv(path)
+            return path
+    return None
@@ -0,0 +1,313 @@
+"""
+Spectator mode: watch games running inside training workers.
+
+Workers publish compact binary snapshots of selected games as UDP datagrams
+on localhost (SpectatorPublisher, usually via the Spectate env wrapper). A
+separate viewer process (`python -m src spectate`) receives them, rebuilds
+a shadow FlappyGame/SnakeGame from the latest snapshot and draws it with the
+shared renderers.
+
+Publishing never blocks: sends are non-blocking, rate limited per stream,
+and dropped if the socket buffer is full or nobody is listening. The viewer
+likewise drains its socket each frame and only draws the newest snapshot.
+
+Snapshot layout (little endian), after a common header
+`magic "SP", version u8, kind u8, stream u16, seq u32`:
+
+    flappy: screen_w, screen_h, bird_x, bird_radius, pipe_width, gap_size (f32 x6),
+            bird_y f32, ticks u32, score u32, done u8, n_pipes u8,
+            then per pipe: top_x, top_h, bottom_y, bottom_h (f32 x4)
+    snake:  cols u16, rows u16, steps u32, score u32, done u8,
+            food cell i32 (-1 if none), length u32, head cell u32,
+            then the body as 2-bit moves from each segment to the next
+
+Flappy geometry is sent as floats because config overrides may be
+fractional (e.g. --set pipe_width=70.5). A game that doesn't fit the format
+is dropped like any other unsendable frame.
+"""
+import socket
+import struct
+import time
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 5555
+MAX_DATAGRAM = 60000
+
+MAGIC = b"SP"
+VERSION = 2
+KIND_FLAPPY = 0
+KIND_SNAKE = 1
+
+_HEADER = struct.Struct("<2sBBHI")
+_FLAPPY = struct.Struct("<6ffIIBB")
+_PIPE = struct.Struct("<4f")
+_SNAKE = struct.Struct("<HHIIBiII")
+
+# Direction codes for the packed snake body
+_MOVES = ((0, -1), (1, 0), (0, 1), (-1, 0))
+_MOVE_CODE = {move: code for code, move in enumerate(_MOVES)}
+
+
+def parse_address(text, default_port=DEFAULT_PORT):
+    """Parse "host:port", ":port", "port" or "host" into a (host, port) tuple."""
+    host, sep, port = text.rpartition(":")
+    if not sep:
+        if text.isdigit():
+            return DEFAULT_HOST, int(text)
+        return text or DEFAULT_HOST, default_port
+    return host or DEFAULT_HOST, int(port)
+
+
+def encode(game, stream, seq):
+    """Encode a FlappyGame or SnakeGame snapshot; returns bytes."""
+    if hasattr(game, "pipes"):
+        return _encode_flappy(game, stream, seq)
+    return _encode_snake(game, stream, seq)
+
+
+def _encode_flappy(game, stream, seq):
+    pipes = game.pipes[:255]
+    parts = [
+        _HEADER.pack(MAGIC, VERSION, KIND_FLAPPY, stream, seq),
+        _FLAPPY.pack(game.SCREEN_W, game.SCREEN_H, game.BIRD_X, game.BIRD_RADIUS,
+                     game.PIPE_WIDTH, game.GAP_SIZE, game.bird_y, game.ticks, game.score,
+                     game.done, len(pipes)),
+    ]
+    for p in pipes:
+        parts.append(_PIPE.pack(p["top_x"], p["top_h"], p["bottom_y"], p["bottom_h"]))
+    return b"".join(parts)
+
+
+def _encode_snake(game, stream, seq):
+    cols = game.COLS
+    food = game.food[1] * cols + game.food[0] if game.food is not None else -1
+    snake = game.snake
+    head = snake[0][1] * cols + snake[0][0] if snake else 0
+    packed = bytearray((len(snake) + 2) // 4)
+    prev = None
+    for i, (x, y) in enumerate(snake):
+        if prev is not None:
+            code = _MOVE_CODE[(x - prev[0], y - prev[1])]
+            j = i - 1
+            packed[j >> 2] |= code << ((j & 3) * 2)
+        prev = (x, y)
+    return b"".join((
+        _HEADER.pack(MAGIC, VERSION, KIND_SNAKE, stream, seq),
+        _SNAKE.pack(cols, game.ROWS, game.steps, game.score, game.done, food, len(snake), head),
+        bytes(packed),
+    ))
+
+
+def decode(data):
+    """Decode a snapshot into (kind, stream, seq, state dict); None if malformed."""
+    if len(data) < _HEADER.size:
+        return None
+    magic, version, kind, stream, seq = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        return None
+    try:
+        if kind == KIND_FLAPPY:
+            return kind, stream, seq, _decode_flappy(data, _HEADER.size)
+        if kind == KIND_SNAKE:
+            return kind, stream, seq, _decode_snake(data, _HEADER.size)
+    except (struct.error, IndexError, KeyError):
+        pass
+    return None
+
+
+def _decode_flappy(data, offset):
+    (screen_w, screen_h, bird_x, bird_radius, pipe_width, gap_size,
+     bird_y, ticks, score, done, n_pipes) = _FLAPPY.unpack_from(data, offset)
+    offset += _FLAPPY.size
+    pipes = []
+    for _ in range(n_pipes):
+        top_x, top_h, bottom_y, bottom_h = _PIPE.unpack_from(data, offset)
+        offset += _PIPE.size
+        pipes.append({"top_x": top_x, "top_y": 0, "top_h": top_h, "bottom_x": top_x,
+                      "bottom_y": bottom_y, "bottom_h": bottom_h, "gap_y": top_h, "passed": False})
+    return {
+        "layout": (screen_w, screen_h, bird_x, bird_radius, pipe_width, gap_size),
+        "bird_y": bird_y, "ticks": ticks, "score": score, "done": bool(done), "pipes": pipes,
+    }
+
+
+def _decode_snake(data, offset):
+    cols, rows, steps, score, done, food, length, head = _SNAKE.unpack_from(data, offset)
+    offset += _SNAKE.size
+    snake = []
+    if length:
+        x, y = head % cols, head // cols
+        snake.append((x, y))
+        for j in range(length - 1):
+            dx, dy = _MOVES[(data[offset + (j >> 2)] >> ((j & 3) * 2)) & 3]
+            x, y = x + dx, y + dy
+            snake.append((x, y))
+    return {
+        "layout": (cols, rows), "steps": steps, "score": score, "done": bool(done),
+        "food": (food % cols, food // cols) if food >= 0 else None, "snake": snake,
+    }
+
+
+class SpectatorPublisher:
+    """
+    Fire-and-forget snapshot sender.
+
+    publish() is cheap to call every step: it returns immediately unless
+    1/max_hz seconds have passed since the stream's last snapshot, and any
+    send that would block (or fails) just drops the frame.
+    """
+
+    def __init__(self, address=(DEFAULT_HOST, DEFAULT_PORT), max_hz=30.0):
+        self.address = address
+        self.interval = 1.0 / max_hz if max_hz else 0.0
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setblocking(False)
+        self._next_time = {}
+        self._seq = {}
+        self.sent = 0
+        self.dropped = 0
+
+    def publish(self, game, stream=0, force=False):
+        now = time.monotonic()
+        if not force and now < self._next_time.get(stream, 0.0):
+            return False
+        self._next_time[stream] = now + self.interval
+        seq = self._seq.get(stream, 0)
+        self._seq[stream] = seq + 1
+        try:
+            data = encode(game, stream, seq & 0xFFFFFFFF)
+        except struct.error:  # a value outside the snapshot format; never break the run
+            self.dropped += 1
+            return False
+        if len(data) > MAX_DATAGRAM:
+            self.dropped += 1
+            return False
+        try:
+            self.sock.sendto(data, self.address)
+        except OSError:  # includes BlockingIOError: buffer full, drop the frame
+            self.dropped += 1
+            return False
+        self.sent += 1
+        return True
+
+    def close(self):
+        self.sock.close()
+
+
+def apply_snapshot(kind, state, game=None):
+    """
+    Update (or create) a shadow game from a decoded snapshot and return it.
+
+    A new game object is created when the kind or board/screen layout changes.
+    """
+    if kind == KIND_FLAPPY:
+        from src.flappy.game import FlappyConfig, FlappyGame
+        screen_w, screen_h, bird_x, bird_radius, pipe_width, gap_size = state["layout"]
+        if game is None or getattr(game, "_spectate_layout", None) != (kind, state["layout"]):
+            game = FlappyGame(FlappyConfig(screen_w=screen_w, screen_h=screen_h, bird_x=bird_x,
+                                           bird_radius=bird_radius, pipe_width=pipe_width,
+                                           gap_size=gap_size, pipe_margin=0))
+            game._spectate_layout = (kind, state["layout"])
+        game.bird_y = state["bird_y"]
+        game.ticks = state["ticks"]
+        game.score = state["score"]
+        game.done = state["done"]
+        game.pipes = state["pipes"]
+        return game
+
+    from collections import deque
+    from src.snake.game import SnakeConfig, SnakeGame
+    cols, rows = state["layout"]
+    if game is None or getattr(game, "_spectate_layout", None) != (kind, state["layout"]):
+        game = SnakeGame(SnakeConfig(cols=cols, rows=rows))
+        game._spectate_layout = (kind, state["layout"])
+    game.snake = deque(state["snake"])
+    game._occupied = set(state["snake"])
+    game.food = state["food"]
+    game.steps = state["steps"]
+    game.score = state["score"]
+    game.done = state["done"]
+    return game
+
+
+def run_viewer(address=(DEFAULT_HOST, DEFAULT_PORT), stream=None, fps=60):
+    """
+    Show snapshots received on address until the window is closed.
+
+    Shows `stream` (or the first one seen); TAB cycles through the streams
+    received so far.
+    """
+    from src.common import render
+    pygame = render.pygame
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+    sock.bind(address)
+    sock.setblocking(False)
+    print(f"Spectator listening on {address[0]}:{address[1]}")
+
+    latest = {}  # stream -> (kind, state) of the newest snapshot
+    fresh = set()  # streams with a snapshot not drawn yet
+    game = screen = renderer = None
+    shown = None  # (kind, layout) the window was opened for
+    received = 0
+    clock = None
+    running = True
+    while running:
+        # Drain everything queued; only the newest snapshot per stream matters
+        while True:
+            try:
+                data = sock.recv(65536)
+            except BlockingIOError:
+                break
+            snapshot = decode(data)
+            if snapshot is None:
+                continue
+            # Localhost datagrams arrive in order, so the last one read wins
+            kind, sid, _, state = snapshot
+            latest[sid] = (kind, state)
+            fresh.add(sid)
+            received += 1
+        if stream is None and latest:
+            stream = min(latest)
+
+        if clock is not None:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        running = False
+                    if event.key == pygame.K_TAB and latest:
+                        ids = sorted(latest)
+                        stream = ids[(ids.index(stream) + 1) % len(ids)] if stream in ids else ids[0]
+                        shown = None
+
+        if stream in fresh or (stream in latest and shown is None):
+            fresh.clear()
+            kind, state = latest[stream]
+            game = apply_snapshot(kind, state, game)
+            layout = (kind, state["layout"])
+            if layout != shown:
+                if kind == KIND_FLAPPY:
+                    size = (game.SCREEN_W, game.SCREEN_H)
+                else:
+                    cell = render.snake_cell_size(game)
+                    size = (game.COLS * cell, game.ROWS * cell)
+                screen = render.open_window(size, f"Spectating stream {stream}")
+                if kind == KIND_FLAPPY:
+                    renderer = render.FlappyRenderer(game, screen)
+                else:
+                    renderer = render.SnakeRenderer(game, screen, cell)
+                clock = pygame.time.Clock()
+                shown = layout
+            renderer.game = game
+            render.present(renderer.draw())
+        if clock is None:
+            time.sleep(1.0 / fps)  # no window yet: wait for the first snapshot
+        else:
+            clock.tick(fps)
+    sock.close()
+    if clock is not None:
+        pygame.quit()
+    print(f"Received {received} snapshots")
@@ -0,0 +1,55 @@
+"""Gymnasium wrappers shared by the game environments."""
+import gymnasium as gym
+
+
+class FrameSkip(gym.Wrapper):
+    """
+    Repeat each action for `skip` steps, summing the rewards.
+
+    Stops early when the episode terminates or is truncated; the returned
+    info is the one from the last inner step.
+    """
+
+    def __init__(self, env, skip):
+        super().__init__(env)
+        if skip < 1:
+            raise ValueError(f"skip must be >= 1, got {skip}")
+        self.skip = skip
+
+    def step(self, action):
+        total_reward = 0.0
+        for _ in range(self.skip):
+            obs, reward, terminated, truncated, info = self.env.step(action)
+            total_reward += reward
+            if terminated or truncated:
+                break
+        return obs, total_reward, terminated, truncated, info
+
+
+class Spectate(gym.Wrapper):
+    """
+    Publish snapshots of the wrapped env's game for `python -m src spectate`.
+
+    Snapshots are rate limited and sent without blocking (see
+    src.common.spectate), so this adds next to nothing to a training step.
+    """
+
+    def __init__(self, env, address, stream=0, max_hz=30.0):
+        super().__init__(env)
+        from src.common.spectate import SpectatorPublisher
+        self.stream = stream
+        self.publisher = SpectatorPublisher(address, max_hz=max_hz)
+
+    def reset(self, **kwargs):
+        result = self.env.reset(**kwargs)
+        self.publisher.publish(self.env.unwrapped.game, self.stream)
+        return result
+
+    def step(self, action):
+        result = self.env.step(action)
+        self.publisher.publish(self.env.unwrapped.game, self.stream)
+        return result
+
+    def close(self):
+        self.publisher.close()
+        super().close()
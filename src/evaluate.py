@@ -0,0 +1,244 @@
+"""
+Cached evaluation of deterministic agents, behind `python -m src eval`.
+
+Episode i of an evaluation with seed S is played on a fresh agent with the
+env (and its action space) seeded with S + i; agents whose constructor takes
+a `seed` get S + i as well, unless --agent-param sets one. Every episode's
+outcome then depends only on its own inputs:
+
+    (game code, config, frame_skip, agent code + class + params, episode seed)
+
+Results are cached per episode in an SQLite file under that key, so
+re-running an evaluation only simulates episodes that are new or whose
+inputs changed. The code parts are hashes of the source files of the game,
+env and agent modules (and the shared wrappers), so editing FlappyGame,
+SnakeGame or an agent invalidates its cached results without any version
+bookkeeping. The cache is bounded by size: least recently used entries are
+evicted once it grows past max_bytes.
+
+Only agents that declare themselves deterministic (Agent.deterministic,
+e.g. HeuristicAgent, RandomAgent via the seeded action space, RolloutAgent
+without a time_budget) can be cached; evaluate() raises ValueError for
+others unless cache=None.
+"""
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import sqlite3
+import time
+
+from src.registry import get_game, load
+from src.runner import EpisodeResult, make_env, split_episodes
+
+DEFAULT_CACHE_PATH = os.path.join("runs", "cache", "eval.sqlite3")
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+_ROW_OVERHEAD = 64  # rough per-row bytes on top of key and value, for the size bound
+_SHARED_MODULES = ("src.common.wrappers",)
+
+
+def source_hash(*module_names):
+    """sha1 over the source files of the given modules (without importing them)."""
+    h = hashlib.sha1()
+    for name in module_names:
+        origin = importlib.util.find_spec(name).origin
+        with open(origin, "rb") as f:
+            h.update(name.encode())
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def _module(path):
+    return path.partition(":")[0]
+
+
+def eval_context(game, agent, agent_params=None, config=None, frame_skip=1):
+    """Everything but the seed that determines an episode's result, as a JSON-able dict."""
+    spec = get_game(game)
+    if agent not in spec.agents:
+        raise ValueError(f"Unknown agent for {game}: {agent} (choose from {', '.join(spec.agents)})")
+    if config is None:
+        config = load(spec.config)()
+    return {
+        "game": game,
+        "game_code": source_hash(_module(spec.game), _module(spec.env), *_SHARED_MODULES),
+        "config": config._asdict(),
+        "frame_skip": frame_skip,
+        "agent": spec.agents[agent],
+        "agent_code": source_hash(_module(spec.agents[agent])),
+        "agent_params": agent_params or {},
+    }
+
+
+def episode_key(context_hash, seed):
+    return hashlib.sha1(f"{context_hash}:{seed}".encode()).hexdigest()
+
+
+class EvalCache:
+    """Size-bounded LRU store of per-episode results in one SQLite file."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_CACHE_BYTES):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.db = sqlite3.connect(path, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS episodes ("
+                        "key TEXT PRIMARY KEY, result TEXT NOT NULL, size INTEGER NOT NULL, used REAL NOT NULL)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS episodes_used ON episodes(used)")
+        self.db.commit()
+
+    def get_many(self, keys):
+        """{key: result} for the keys present; marks them as recently used."""
+        found = {}
+        keys = list(keys)
+        for i in range(0, len(keys), 500):  # stay under SQLite's parameter limit
+            chunk = keys[i:i + 500]
+            rows = self.db.execute(f"SELECT key, result FROM episodes WHERE key IN ({','.join('?' * len(chunk))})",
+                                   chunk).fetchall()
+            found.update((key, json.loads(result)) for key, result in rows)
+        if found:
+            now = time.time()
+            self.db.executemany("UPDATE episodes SET used = ? WHERE key = ?", [(now, k) for k in found])
+            self.db.commit()
+        return found
+
+    def put_many(self, items):
+        """Store {key: result} and evict least recently used entries beyond max_bytes."""
+        now = time.time()
+        rows = []
+        for key, result in items.items():
+            value = json.dumps(result)
+            rows.append((key, value, len(key) + len(value) + _ROW_OVERHEAD, now))
+        self.db.executemany("INSERT OR REPLACE INTO episodes VALUES (?, ?, ?, ?)", rows)
+        self._evict()
+        self.db.commit()
+
+    def _evict(self):
+        excess = self.size() - self.max_bytes
+        while excess > 0:
+            oldest = self.db.execute("SELECT key, size FROM episodes ORDER BY used LIMIT 1000").fetchall()
+            if not oldest:
+                break
+            doomed = []
+            for key, size in oldest:
+                doomed.append((key,))
+                excess -= size
+                if excess <= 0:
+                    break
+            self.db.executemany("DELETE FROM episodes WHERE key = ?", doomed)
+
+    def size(self):
+        return self.db.execute("SELECT COALESCE(SUM(size), 0) FROM episodes").fetchone()[0]
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM episodes").fetchone()[0]
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def agent_kwargs(agent_cls, agent_params, seed):
+    """Constructor kwargs for one episode: agent_params, plus the episode seed if the agent takes one."""
+    kwargs = dict(agent_params or {})
+    if "seed" not in kwargs and "seed" in inspect.signature(agent_cls.__init__).parameters:
+        kwargs["seed"] = seed
+    return kwargs
+
+
+def run_episodes(job):
+    """Play the given (episode, seed) pairs; executed in a worker process."""
+    from src.registry import get_agent_class
+
+    game, agent_name, agent_params, config, frame_skip, episodes = job
+    env = make_env(game, config, frame_skip)
+    agent_cls = get_agent_class(game, agent_name)
+    results = []
+    for episode, seed in episodes:
+        agent = agent_cls(env.action_space, **agent_kwargs(agent_cls, agent_params, seed))
+        agent.attach([env])
+        env.action_space.seed(seed)
+        obs, info = env.reset(seed=seed)
+        done = False
+        total_reward = 0.0
+        steps = 0
+        while not done:
+            action = agent.select_action(obs)
+            obs, reward, terminated, truncated, info = env.step(action)
+            done = terminated or truncated
+            total_reward += reward
+            steps += 1
+        results.append(EpisodeResult(0, 0, episode, steps, total_reward, info.get("score", 0)))
+    env.close()
+    return results
+
+
+def evaluate(game, agent, agent_params=None, config=None, episodes=100, seed=0, frame_skip=1,
+             cache=None, workers=1, on_episode=None):
+    """
+    Evaluate agent on episodes seeded seed, seed+1, ...; returns (results, hits).
+
+    Cached episodes are taken from `cache` (an EvalCache, or None to always
+    simulate); the rest run across `workers` processes and are added to it.
+    """
+    context = eval_context(game, agent, agent_params, config, frame_skip)
+    if cache is not None:
+        from src.registry import get_agent_class
+        agent_cls = get_agent_class(game, agent)
+        env = make_env(game, config, frame_skip)
+        probe = agent_cls(env.action_space, **agent_kwargs(agent_cls, agent_params, seed))
+        env.close()
+        if not probe.deterministic:
+            raise ValueError(f"The {agent} agent with {agent_params or {}} is not deterministic, so its "
+                             f"results can't be cached; evaluate it without the cache (--no-cache)")
+    context_hash = hashlib.sha1(json.dumps(context, sort_keys=True, default=str).encode()).hexdigest()
+    keys = {i: episode_key(context_hash, seed + i) for i in range(episodes)}
+    cached = cache.get_many(keys.values()) if cache is not None else {}
+
+    results = {}
+    for i, key in keys.items():
+        if key in cached:
+            r = cached[key]
+            results[i] = EpisodeResult(0, 0, i, r["steps"], r["total_reward"], r["score"])
+            if on_episode is not None:
+                on_episode(results[i])
+    missing = [(i, seed + i) for i in range(episodes) if i not in results]
+
+    fresh = []
+    if missing and workers <= 1:
+        fresh = run_episodes((game, agent, agent_params, config, frame_skip, missing))
+        if on_episode is not None:
+            for r in fresh:
+                on_episode(r)
+    elif missing:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        jobs, start = [], 0
+        for count in split_episodes(len(missing), workers):
+            if count:
+                jobs.append((game, agent, agent_params, config, frame_skip, missing[start:start + count]))
+            start += count
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=len(jobs), mp_context=ctx) as pool:
+            for future in as_completed([pool.submit(run_episodes, job) for job in jobs]):
+                for r in future.result():
+                    fresh.append(r)
+                    if on_episode is not None:
+                        on_episode(r)
+
+    for r in fresh:
+        results[r.episode] = r
+    if cache is not None and fresh:
+        cache.put_many({keys[r.episode]: {"steps": r.steps, "total_reward": r.total_reward, "score": r.score}
+                        for r in fresh})
+    return [results[i] for i in range(episodes)], len(cached)
@@ -1,4 +1,3 @@
-import random
 from src.common.agent import Agent
 
 class HeuristicAgent(Agent):
@@ -7,6 +6,8 @@ class HeuristicAgent(Agent):
     - Flap if the bird is below the center of the next pipe gap.
     - Otherwise, do nothing.
     """
+    deterministic = True
+
     def __init__(self, action_space):
         super().__init__(action_space)
 
@@ -1,10 +1,11 @@
-import numpy as np
 from src.common.agent import Agent
 
 class RandomAgent(Agent):
     """
     A simple agent that takes random actions from the environment's action space.
     """
+    deterministic = True  # given a seeded action space
+
     def __init__(self, action_space):
         super().__init__(action_space)
 
@@ -0,0 +1,150 @@
+import random
+import time
+
+from src.common.agent import Agent
+from src.common.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+class RolloutAgent(Agent):
+    """
+    Monte Carlo lookahead agent for Flappy Bird.
+
+    Each decision clones the game state: bird position/velocity, the pipes
+    on screen and the pipe generator's RNG, so future pipes are known
+    exactly (they don't depend on the actions). It then samples `samples`
+    random flap sequences over `horizon` ticks, simulates all of them at
+    once with NumPy, and returns the first action of the sequence that
+    survives longest (ties go to the one ending closest to the upcoming gap
+    centre). The previous plan, shifted by one tick, is always among the
+    candidates.
+
+    With time_budget (seconds) set, more batches of samples are evaluated,
+    each including the best plan so far, for as long as another batch still
+    fits in the budget (the first batch always runs). Without it every
+    decision evaluates one batch, which keeps seeded runs reproducible.
+
+    Needs the game itself, not just the observation: the runner provides it
+    through attach() for single envs and sync vector envs.
+    """
+    needs_game = True
+
+    def __init__(self, action_space, horizon=40, samples=256, time_budget=None, max_flap_prob=0.25, seed=None):
+        super().__init__(action_space)
+        self.horizon = int(horizon)
+        self.samples = max(3, int(samples))
+        self.time_budget = time_budget
+        self.max_flap_prob = max_flap_prob
+        self.rng = np.random.default_rng(seed)
+        # Reproducible only with a fixed seed and without the wall-clock budget
+        self.deterministic = seed is not None and time_budget is None
+        self.games = None
+        self._plans = {}
+
+    def attach(self, envs):
+        self.games = [env.unwrapped.game for env in envs]
+        self._plans = {}
+
+    def select_action(self, obs):
+        return self._plan(0)
+
+    def select_actions(self, obs_batch):
+        return [self._plan(i) for i in range(len(obs_batch))]
+
+    def learn(self, *args, **kwargs):
+        pass  # Planning only, nothing to learn
+
+    def _plan(self, index):
+        if self.games is None:
+            raise RuntimeError("RolloutAgent needs the game state: run it with a single env or --vec sync "
+                               "(not --vec async or --inference-server)")
+        game = self.games[index]
+        if game.done:
+            return 0
+        start = time.perf_counter()
+        lo, hi, target = self._corridor(game)
+        best_value, best_plan = None, None
+        previous = self._plans.get(index)
+        # Last decision's plan, moved on by the tick that has passed since
+        incumbent = None if previous is None else np.append(previous[1:], False)
+        while True:
+            batch_start = time.perf_counter()
+            flaps = self._candidates(incumbent)
+            values = self._evaluate(game, flaps, lo, hi, target)
+            i = int(np.argmax(values))
+            if best_value is None or values[i] > best_value:
+                best_value, best_plan = values[i], flaps[i]
+            incumbent = best_plan  # same tick: carried into the next batch as is
+            if self.time_budget is None:
+                break
+            now = time.perf_counter()
+            # Stop unless another batch (taking about as long as this one) still fits
+            if now - start + (now - batch_start) > self.time_budget:
+                break
+        self._plans[index] = best_plan
+        return int(best_plan[0])
+
+    def _candidates(self, incumbent):
+        """Random flap sequences, plus do-nothing, flap-once and the incumbent plan (if any)."""
+        k, h = self.samples, self.horizon
+        probs = self.rng.uniform(0.0, self.max_flap_prob, size=(k, 1))
+        flaps = self.rng.random((k, h)) < probs
+        flaps[0] = False
+        flaps[1] = False
+        flaps[1, 0] = True
+        if incumbent is not None:
+            flaps[2] = incumbent
+        return flaps
+
+    def _corridor(self, game):
+        """
+        Allowed bird_y range at each future tick (pipes only) and the gap centre
+        the bird faces at the end of the horizon. Replays the game's pipe
+        schedule with a copy of its RNG.
+        """
+        h = self.horizon
+        r = game.BIRD_RADIUS
+        bird_left, bird_right = game.BIRD_X - r, game.BIRD_X + r
+        rng = random.Random()
+        rng.setstate(game.rng.getstate())
+        pipes = [[p["top_x"], p["top_h"], p["bottom_y"]] for p in game.pipes]
+        last_pipe_tick = game.last_pipe_tick
+        lo = np.full(h, -np.inf)
+        hi = np.full(h, np.inf)
+        for s in range(h):
+            tick = game.ticks + s
+            if tick - last_pipe_tick >= game.PIPE_INTERVAL_TICKS:
+                gap_y = rng.randint(game.PIPE_MARGIN, game.SCREEN_H - game.PIPE_MARGIN - game.GAP_SIZE)
+                pipes.append([game.SCREEN_W, gap_y, gap_y + game.GAP_SIZE])
+                last_pipe_tick = tick
+            for p in pipes:
+                p[0] -= game.PIPE_SPEED
+            for p in pipes:
+                if p[0] >= bird_right:
+                    break  # pipes are ordered by x
+                if p[0] + game.PIPE_WIDTH > bird_left:
+                    lo[s] = max(lo[s], p[1] + r)
+                    hi[s] = min(hi[s], p[2] - r)
+        target = game.SCREEN_H / 2
+        for p in pipes:
+            if p[0] + game.PIPE_WIDTH >= bird_left:
+                target = (p[1] + p[2]) / 2
+                break
+        return lo, hi, target
+
+    def _evaluate(self, game, flaps, lo, hi, target):
+        """Simulate all flap sequences at once; returns one value per sequence."""
+        k = len(flaps)
+        r = game.BIRD_RADIUS
+        y = np.full(k, float(game.bird_y))
+        v = np.full(k, float(game.bird_v))
+        alive = np.ones(k, dtype=bool)
+        survived = np.zeros(k)
+        for s in range(self.horizon):
+            # Same update order and float64 arithmetic as FlappyGame.step
+            v = np.where(flaps[:, s], float(game.FLAP_STRENGTH), v) + game.GRAVITY
+            y = y + v
+            alive &= (y - r > 0) & (y + r < game.SCREEN_H) & (y >= lo[s]) & (y <= hi[s])
+            survived += alive
+        return survived * (2 * game.SCREEN_H) - np.minimum(np.abs(y - target), game.SCREEN_H)
@@ -3,12 +3,63 @@ Flappy Bird game logic - programmatic API for RL training.
 Returns observation, reward, done, info on each step.
 """
 import random
+from collections import namedtuple
+
+from src.common.config import check_field_types
+
+_FLAPPY_FIELDS = {
+    "screen_w": 400,
+    "screen_h": 600,
+    "bird_x": 80,
+    "bird_radius": 16,
+    "gravity": 0.5,
+    "flap_strength": -9,
+    "pipe_width": 70,
+    "gap_size": 160,
+    "pipe_speed": 3,
+    "pipe_interval_ticks": 25,
+    "pipe_margin": 100,  # min distance from the gap to the top/bottom edge
+    # Reward shaping
+    "reward_alive": 0.01,  # every step survived
+    "reward_pipe": 1.0,  # passing a pipe (replaces reward_alive for that step)
+    "reward_crash": -1.0,
+    # Episodes still running after max_steps ticks end as truncated (0: no limit)
+    "max_steps": 10_000,
+}
+
+_FlappyConfigBase = namedtuple("FlappyConfig", list(_FLAPPY_FIELDS),
+                               defaults=list(_FLAPPY_FIELDS.values()))
+
+
+class FlappyConfig(_FlappyConfigBase):
+    """Per-instance physics and layout settings for FlappyGame."""
+    
+    __slots__ = ()
+    
+    def __new__(cls, *args, **kwargs):
+        self = super().__new__(cls, *args, **kwargs)
+        # Pipe gaps are drawn with randint, so their bounds must be whole numbers
+        check_field_types(self, integers=("screen_h", "gap_size", "pipe_margin", "max_steps"))
+        if self.screen_h - 2 * self.pipe_margin < self.gap_size:
+            raise ValueError(
+                f"gap_size={self.gap_size} does not fit in screen_h={self.screen_h} "
+                f"with pipe_margin={self.pipe_margin}")
+        if self.pipe_speed <= 0 or self.pipe_interval_ticks <= 0:
+            raise ValueError("pipe_speed and pipe_interval_ticks must be positive")
+        if self.max_steps < 0:
+            raise ValueError("max_steps must be >= 0 (0 disables the limit)")
+        return self
+    
+    @classmethod
+    def _make(cls, iterable):
+        # namedtuple's _make (and _replace, which uses it) bypass __new__
+        return cls(*iterable)
 
 
 class FlappyGame:
     """Flappy Bird game with reset() and step(action) interface."""
     
-    # Game constants matching the app script
+    # Game constants matching the app script (defaults, see FlappyConfig)
     SCREEN_W = 400
     SCREEN_H = 600
     BIRD_X = 80
@@ -19,12 +70,29 @@ class FlappyGame:
     GAP_SIZE = 160
     PIPE_SPEED = 3
     PIPE_INTERVAL_TICKS = 25  # ~1500ms at 60 FPS
+    PIPE_MARGIN = 100
     
     # Action mapping
     ACTION_NOOP = 0
     ACTION_FLAP = 1
     
-    def __init__(self):
+    def __init__(self, config=None):
+        self.config = config if config is not None else FlappyConfig()
+        # Shadow the class defaults so existing game.SCREEN_W style reads
+        # see this instance's settings.
+        self.SCREEN_W = self.config.screen_w
+        self.SCREEN_H = self.config.screen_h
+        self.BIRD_X = self.config.bird_x
+        self.BIRD_RADIUS = self.config.bird_radius
+        self.GRAVITY = self.config.gravity
+        self.FLAP_STRENGTH = self.config.flap_strength
+        self.PIPE_WIDTH = self.config.pipe_width
+        self.GAP_SIZE = self.config.gap_size
+        self.PIPE_SPEED = self.config.pipe_speed
+        self.PIPE_INTERVAL_TICKS = self.config.pipe_interval_ticks
+        self.PIPE_MARGIN = self.config.pipe_margin
+        self.MAX_STEPS = self.config.max_steps
+        self.rng = random.Random()
         self.bird_y = 0.0
         self.bird_v = 0.0
         self.pipes = []
@@ -32,7 +100,12 @@ class FlappyGame:
         self.ticks = 0
         self.last_pipe_tick = 0
         self.done = False
+        self.truncated = False  # done because of the time limit, not a crash
         
+    def seed(self, seed=None):
+        """Seed this game's pipe generator (independent of other instances)."""
+        self.rng.seed(seed)
+    
     def reset(self):
         """Reset the game to initial state."""
         self.bird_y = self.SCREEN_H / 2
@@ -42,12 +115,16 @@ class FlappyGame:
         self.ticks = 0
         self.last_pipe_tick = 0
         self.done = False
+        self.truncated = False
         return self._get_obs()
     
     def step(self, action):
         """
         Take one step in the game.
         
+        The episode also ends (done, with self.truncated set) after
+        MAX_STEPS ticks; a crash on that same tick still counts as a crash.
+        
         Args:
             action: int, 0=no-op, 1=flap
         
@@ -79,22 +156,34 @@ class FlappyGame:
             p["top_x"] -= self.PIPE_SPEED
             p["bottom_x"] -= self.PIPE_SPEED
         
-        # Score and remove offscreen pipes
-        reward = 0.01  # small positive reward for surviving
+        # Score and remove offscreen pipes. Pipes are ordered by x, so both
+        # scans stop at the first pipe still ahead of the bird / on screen.
+        reward = self.config.reward_alive  # small positive reward for surviving
         for p in self.pipes:
-            if not p["passed"] and p["top_x"] + self.PIPE_WIDTH < self.BIRD_X:
+            if p["top_x"] + self.PIPE_WIDTH >= self.BIRD_X:
+                break
+            if not p["passed"]:
                 p["passed"] = True
                 self.score += 1
-                reward = 1.0  # scored a point
+                reward = self.config.reward_pipe  # scored a point
         
-        self.pipes = [p for p in self.pipes if p["top_x"] + self.PIPE_WIDTH > -50]
+        drop = 0
+        for p in self.pipes:
+            if p["top_x"] + self.PIPE_WIDTH > -50:
+                break
+            drop += 1
+        if drop:
+            del self.pipes[:drop]
         
         # Check collision
         if self._collided():
             self.done = True
-            reward = -1.0  # collision penalty
+            reward = self.config.reward_crash  # collision penalty
         
         self.ticks += 1
+        if not self.done and self.MAX_STEPS and self.ticks >= self.MAX_STEPS:
+            self.done = True
+            self.truncated = True
         obs = self._get_obs()
         info = {"score": self.score, "ticks": self.ticks}
         
@@ -135,7 +224,7 @@ class FlappyGame:
     
     def _new_pipe(self, x):
         """Create a new pipe at position x."""
-        gap_y = random.randint(100, self.SCREEN_H - 100 - self.GAP_SIZE)
+        gap_y = self.rng.randint(self.PIPE_MARGIN, self.SCREEN_H - self.PIPE_MARGIN - self.GAP_SIZE)
         return {
             "top_x": x,
             "top_y": 0,
@@ -162,6 +251,8 @@ class FlappyGame:
         for p in self.pipes:
             pipe_left = p["top_x"]
             pipe_right = p["top_x"] + self.PIPE_WIDTH
+            if pipe_left >= bird_right:
+                break  # this and all later pipes are still ahead of the bird
             
             # Check horizontal overlap
             if bird_right > pipe_left and bird_left < pipe_right:
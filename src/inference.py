@@ -0,0 +1,388 @@
+"""
+Policy inference server with request micro-batching.
+
+Instead of every env worker running its own copy of the agent, workers get
+a PolicyClient (itself an Agent) and one server process runs the real agent
+for all of them:
+
+    server = InferenceServer("snake", "random", clients=[8, 8], max_batch_size=64, max_wait=0.002)
+    policies = server.start()          # one PolicyClient per client, picklable into workers
+    action = policies[0].select_action(obs)
+    stats = server.stop()
+
+A client writes its observations into its slots of a shared-memory block and
+sends a tiny request message over its pipe. The server collects requests
+into a micro-batch - up to max_batch_size observations, waiting at most
+max_wait seconds after the first request arrives - runs one
+agent.select_actions() call over the batch, writes the actions back into
+shared memory and wakes the clients. Each client owns as many slots as
+observations it submits at once (e.g. num_envs for a vector env worker).
+
+Any Agent works; agents with a vectorized select_actions() benefit most.
+learn() is not forwarded: the server serves a fixed policy.
+
+Latency is measured per request from the client writing its observation
+to the server writing the action (time.perf_counter is system-wide on
+Linux, so the two processes' timestamps compare).
+"""
+import struct
+import time
+
+from src.common.agent import Agent
+from src.common.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+_COUNT = struct.Struct("<I")
+_STOP = b"stop"
+
+
+def _layout(num_slots, obs_shape, obs_dtype):
+    """Arrays in the shared block as (name, shape, dtype, offset), and the block size."""
+    fields, offset = [], 0
+    for name, shape, dtype in (("obs", (num_slots,) + tuple(obs_shape), obs_dtype),
+                               ("actions", (num_slots,), "int64"),
+                               ("requested", (num_slots,), "float64")):
+        dtype = np.dtype(dtype)
+        offset = -(-offset // 8) * 8  # keep every array 8-byte aligned
+        fields.append((name, shape, dtype.str, offset))
+        offset += dtype.itemsize * int(np.prod(shape))
+    return fields, max(offset, 1)
+
+
+def _attach(shm, fields):
+    return {name: np.ndarray(shape, dtype, buffer=shm.buf, offset=offset)
+            for name, shape, dtype, offset in fields}
+
+
+class LatencyHistogram:
+    """Log-spaced latency histogram (1us..100s): bounded memory, approximate percentiles."""
+
+    EDGES_PER_DECADE = 50
+
+    def __init__(self):
+        self.edges = np.logspace(-6, 2, 8 * self.EDGES_PER_DECADE + 1)
+        self.counts = np.zeros(len(self.edges) + 1, dtype=np.int64)
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, latencies):
+        if len(latencies):
+            self.counts += np.bincount(np.searchsorted(self.edges, latencies), minlength=len(self.counts))
+            self.total += float(latencies.sum())
+            self.max = max(self.max, float(latencies.max()))
+
+    @property
+    def count(self):
+        return int(self.counts.sum())
+
+    def percentile(self, q):
+        """Upper bin edge below which q percent of the samples fall."""
+        count = self.count
+        if not count:
+            return 0.0
+        i = int(np.searchsorted(np.cumsum(self.counts), q / 100 * count))
+        return min(float(self.edges[min(i, len(self.edges) - 1)]), self.max)
+
+    def summary(self):
+        """Latency summary in milliseconds."""
+        count = self.count
+        return {
+            "count": count,
+            "mean_ms": 1000 * self.total / count if count else 0.0,
+            "p50_ms": 1000 * self.percentile(50),
+            "p99_ms": 1000 * self.percentile(99),
+            "max_ms": 1000 * self.max,
+        }
+
+
+class PolicyClient(Agent):
+    """
+    Agent that asks the inference server for actions.
+
+    Picklable (the shared memory is re-attached on first use), so it can be
+    handed to worker processes like any other argument.
+    """
+
+    def __init__(self, action_space, conn, shm_name, fields, start, size):
+        super().__init__(action_space)
+        self.conn = conn
+        self.shm_name = shm_name
+        self.fields = fields
+        self.start = start
+        self.size = size
+        self._shm = None
+        self._arrays = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_shm"] = state["_arrays"] = None
+        return state
+
+    def _slots(self):
+        if self._arrays is None:
+            from multiprocessing import shared_memory
+            self._shm = shared_memory.SharedMemory(name=self.shm_name)
+            self._arrays = _attach(self._shm, self.fields)
+        return self._arrays
+
+    def select_action(self, obs):
+        return int(self._request([obs])[0])
+
+    def select_actions(self, obs_batch):
+        return self._request(obs_batch).copy()
+
+    def _request(self, obs_batch):
+        n = len(obs_batch)
+        if n > self.size:
+            raise ValueError(f"Batch of {n} observations exceeds this client's {self.size} slots")
+        arrays = self._slots()
+        end = self.start + n
+        arrays["obs"][self.start:end] = obs_batch
+        arrays["requested"][self.start:end] = time.perf_counter()
+        self.conn.send_bytes(_COUNT.pack(n))
+        self.conn.recv_bytes()
+        return arrays["actions"][self.start:end]
+
+    def learn(self, *args, **kwargs):
+        pass
+
+    def close(self):
+        if self._shm is not None:
+            self._arrays = None
+            self._shm.close()
+            self._shm = None
+
+
+class InferenceServer:
+    """
+    Runs one agent in a separate process and serves batched actions.
+
+    Args:
+        game, agent, agent_params, config: what to serve (agent built from the registry)
+        clients: number of slots (observations per request) for each client
+        max_batch_size: most observations per forward pass
+        max_wait: seconds to wait for more requests after the first one of a batch
+        seed: seeds the served agent's action space (for sampling agents)
+        report_interval: seconds between throughput/latency reports (0 disables)
+        metrics_dir: if set, one metrics row per batch is written to `<dir>/inference-*.npy`
+    """
+
+    def __init__(self, game, agent, agent_params=None, config=None, clients=(1,), max_batch_size=64,
+                 max_wait=0.002, seed=None, report_interval=5.0, metrics_dir=None, log=print):
+        if max_batch_size < 1 or max_wait < 0:
+            raise ValueError("Need max_batch_size >= 1 and max_wait >= 0")
+        self.game = game
+        self.agent = agent
+        self.agent_params = agent_params or {}
+        self.config = config
+        self.clients = list(clients)
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.seed = seed
+        self.report_interval = report_interval
+        self.metrics_dir = metrics_dir
+        self.log = log
+        self.process = None
+
+    def start(self):
+        """Start the server process; returns one PolicyClient per entry of `clients`."""
+        import multiprocessing
+        from multiprocessing import shared_memory
+        from src.runner import make_env
+
+        env = make_env(self.game, self.config)
+        action_space, obs_space = env.action_space, env.observation_space
+        env.close()
+        if self.seed is not None:
+            action_space.seed(self.seed)
+
+        fields, size = _layout(sum(self.clients), obs_space.shape, obs_space.dtype)
+        self._shm = shared_memory.SharedMemory(create=True, size=size)
+        ctx = multiprocessing.get_context("spawn")
+        pipes = [ctx.Pipe() for _ in self.clients]
+        self._control, server_control = ctx.Pipe()
+        slots, start = [], 0
+        for n in self.clients:
+            slots.append((start, n))
+            start += n
+        self.process = ctx.Process(target=_serve, name="inference-server", daemon=True, args=(
+            [server for _, server in pipes], slots, server_control, self._shm.name, fields,
+            self.game, self.agent, self.agent_params, action_space, self.max_batch_size, self.max_wait,
+            self.report_interval, self.metrics_dir,
+        ))
+        self.process.start()
+        for _, server in pipes:
+            server.close()
+        server_control.close()
+        try:
+            self._control.recv_bytes()  # wait until the agent is built
+        except EOFError:
+            self.process.join()
+            self._shm.close()
+            self._shm.unlink()
+            raise RuntimeError("Inference server failed to start") from None
+        self._client_conns = [client for client, _ in pipes]
+        return [PolicyClient(action_space, client, self._shm.name, fields, start, size)
+                for client, (start, size) in zip(self._client_conns, slots)]
+
+    def stop(self):
+        """Stop the server and return its overall stats."""
+        stats = {}
+        if self.process is None:
+            return stats
+        try:
+            self._control.send_bytes(_STOP)
+            stats = self._control.recv()
+        except (EOFError, OSError):
+            pass
+        self.process.join()
+        self.process = None
+        for conn in self._client_conns + [self._control]:
+            conn.close()
+        self._shm.close()
+        self._shm.unlink()
+        if stats and self.log:
+            self.log(format_stats("inference total", stats))
+        return stats
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def format_stats(label, stats):
+    return (f"{label}: {stats['observations']:,} observations in {stats['batches']:,} batches "
+            f"({stats['obs_per_s']:,.0f} obs/s, mean batch {stats['mean_batch']:.1f}, "
+            f"forward {stats['forward_ms']:.3f}ms/batch), latency mean {stats['mean_ms']:.3f}ms "
+            f"p50 {stats['p50_ms']:.3f}ms p99 {stats['p99_ms']:.3f}ms max {stats['max_ms']:.3f}ms")
+
+
+class _Stats:
+    """Totals over a window that starts at the first request and ends at the last reply."""
+
+    def __init__(self):
+        self.start = None
+        self.end = None
+        self.observations = 0
+        self.batches = 0
+        self.forward = 0.0
+        self.latency = LatencyHistogram()
+
+    def add(self, latencies, forward, done):
+        if self.start is None:
+            self.start = done - float(latencies.max())  # when the oldest request in the batch was made
+        self.end = done
+        self.observations += len(latencies)
+        self.batches += 1
+        self.forward += forward
+        self.latency.add(latencies)
+
+    def summary(self):
+        elapsed = self.end - self.start if self.start is not None else 0.0
+        return {
+            "observations": self.observations,
+            "batches": self.batches,
+            "obs_per_s": self.observations / elapsed if elapsed > 0 else 0.0,
+            "mean_batch": self.observations / self.batches if self.batches else 0.0,
+            "forward_ms": 1000 * self.forward / self.batches if self.batches else 0.0,
+            **self.latency.summary(),
+        }
+
+
+def _serve(conns, slots, control, shm_name, fields, game, agent_name, agent_params, action_space,
+           max_batch_size, max_wait, report_interval, metrics_dir):
+    """Server process main loop."""
+    from multiprocessing import shared_memory
+    from multiprocessing.connection import wait
+    from src.registry import get_agent_class
+
+    agent = get_agent_class(game, agent_name)(action_space, **agent_params)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    arrays = _attach(shm, fields)
+    obs, actions, requested = arrays["obs"], arrays["actions"], arrays["requested"]
+    metrics = None
+    if metrics_dir:
+        from src.common.metrics import MetricsWriter
+        metrics = MetricsWriter(metrics_dir, "inference", ("time", "batch_size", "forward_ms", "max_latency_ms"))
+
+    control.send_bytes(b"ready")
+
+    slot_of = {conn: slot for conn, slot in zip(conns, slots)}
+    idle = set(conns)  # clients without an outstanding request
+    carry = []  # requests read but left for the next batch
+    total, interval = _Stats(), _Stats()
+    next_report = time.perf_counter() + report_interval if report_interval else None
+
+    def read(conn):
+        idle.discard(conn)
+        try:
+            return conn, _COUNT.unpack(conn.recv_bytes())[0]
+        except EOFError:  # client went away
+            del slot_of[conn]
+            return None
+
+    running = True
+    while running:
+        queued, carry = carry, []  # requests left over from the last batch go first
+        if not queued:
+            timeout = max(0.0, next_report - time.perf_counter()) if next_report else None
+            ready = wait(list(idle) + [control], timeout)
+            if control in ready:
+                running = False
+                ready.remove(control)
+            queued = [r for r in map(read, ready) if r is not None]
+        batch, size = [], 0
+        deadline = time.perf_counter() + max_wait
+        while True:
+            for request in queued:
+                if batch and size + request[1] > max_batch_size:
+                    carry.append(request)
+                else:
+                    batch.append(request)
+                    size += request[1]
+            if not (running and batch and size < max_batch_size and idle) or carry:
+                break
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            ready = wait(list(idle) + [control], remaining)
+            if not ready:
+                break
+            if control in ready:
+                running = False
+                ready.remove(control)
+            queued = [r for r in map(read, ready) if r is not None]
+
+        if batch:
+            index = np.concatenate([np.arange(slot_of[conn][0], slot_of[conn][0] + n) for conn, n in batch])
+            t0 = time.perf_counter()
+            actions[index] = np.asarray(agent.select_actions(obs[index])).reshape(-1)
+            done = time.perf_counter()
+            latencies = done - requested[index]  # before replying: clients reuse their slots
+            for conn, _ in batch:
+                conn.send_bytes(b"")
+                idle.add(conn)
+            total.add(latencies, done - t0, done)
+            interval.add(latencies, done - t0, done)
+            if metrics is not None:
+                metrics.log(done, size, 1000 * (done - t0), 1000 * float(latencies.max()))
+
+        if next_report is not None and time.perf_counter() >= next_report:
+            if interval.observations:
+                print(format_stats("inference", interval.summary()), flush=True)
+            interval = _Stats()
+            next_report = time.perf_counter() + report_interval
+
+    # Answer requests that were already read, so no client is left waiting
+    for conn, n in carry:
+        start = slot_of[conn][0]
+        actions[start:start + n] = np.asarray(agent.select_actions(obs[start:start + n])).reshape(-1)
+        conn.send_bytes(b"")
+    if metrics is not None:
+        metrics.close()
+    del obs, actions, requested, arrays
+    shm.close()
+    control.send(total.summary())
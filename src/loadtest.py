@@ -0,0 +1,137 @@
+"""
+Load test for the game server: many simulated agents in one event loop.
+
+    python -m src.loadtest flappy --clients 2000 --steps 200
+    python -m src.loadtest snake --clients 500 --address :7777   # against a running `python -m src serve`
+
+Without --address a server is started in a subprocess (its periodic report
+is printed alongside). Each client connects, waits until all clients are
+connected, then plays random actions for --steps steps, resetting when its
+game ends. Round-trip times are measured client side.
+"""
+import argparse
+import asyncio
+import random
+import socket
+import subprocess
+import sys
+import time
+
+from src.bench import print_table
+from src.client import AsyncGameClient
+from src.server import DEFAULT_PORT, percentile
+
+
+async def _client(index, address, seed, steps, start, connected, semaphore):
+    async with semaphore:  # don't flood the listen backlog
+        client = await AsyncGameClient.connect(address, seed=None if seed is None else seed + index)
+    connected.append(client)
+    await start.wait()
+    rng = random.Random(index if seed is None else seed + index)
+    done = False
+    for _ in range(steps):
+        if done:
+            await client.reset()
+            done = False
+        else:
+            _, _, terminated, truncated, _ = await client.step(rng.randrange(client.n_actions))
+            done = terminated or truncated
+    await client.close()
+    return list(client.rtts)
+
+
+async def run_load(address, clients, steps, seed=None, max_connecting=256):
+    """Run the load test; returns (per-client RTT lists, connect seconds, run seconds)."""
+    start, connected = asyncio.Event(), []
+    semaphore = asyncio.Semaphore(max_connecting)
+    t0 = time.perf_counter()
+    tasks = [asyncio.create_task(_client(i, address, seed, steps, start, connected, semaphore))
+             for i in range(clients)]
+    while len(connected) < clients:
+        failed = [t for t in tasks if t.done() and t.exception() is not None]
+        if failed:
+            for t in tasks:
+                t.cancel()
+            raise failed[0].exception()
+        await asyncio.sleep(0.01)
+    t1 = time.perf_counter()
+    start.set()
+    rtts = await asyncio.gather(*tasks)
+    return rtts, t1 - t0, time.perf_counter() - t1
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for_server(address, process, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("Server exited during startup")
+        try:
+            socket.create_connection(address, timeout=1.0).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Server did not start listening on {address[0]}:{address[1]}")
+
+
+def _ms(seconds):
+    return f"{1000 * seconds:.3f}"
+
+
+def main(argv=None):
+    from src.common.spectate import parse_address
+    from src.registry import GAMES
+
+    parser = argparse.ArgumentParser(prog="python -m src.loadtest", description="Load test the game server")
+    parser.add_argument("game", choices=sorted(GAMES))
+    parser.add_argument("--clients", type=int, default=1000, help="Simulated agents")
+    parser.add_argument("--steps", type=int, default=200, help="Steps per client")
+    parser.add_argument("--seed", type=int, default=None, help="Base seed for games and actions")
+    parser.add_argument("--address", default=None, metavar="HOST:PORT",
+                        help="Use a running server instead of starting one")
+    parser.add_argument("--tick-hz", type=float, default=0, help="Tick rate of the started server (0 = unpaced)")
+    parser.add_argument("--set", dest="overrides", action="append", default=[], metavar="KEY=VALUE",
+                        help="Config override for the started server (repeatable)")
+    args = parser.parse_args(argv)
+
+    process = None
+    if args.address:
+        address = parse_address(args.address, DEFAULT_PORT)
+    else:
+        address = ("127.0.0.1", _free_port())
+        cmd = [sys.executable, "-m", "src", "serve", args.game, "--address", f"{address[0]}:{address[1]}",
+               "--tick-hz", str(args.tick_hz)]
+        for override in args.overrides:
+            cmd += ["--set", override]
+        process = subprocess.Popen(cmd)
+    try:
+        if process is not None:
+            _wait_for_server(address, process)
+        rtts, connect_time, elapsed = asyncio.run(run_load(address, args.clients, args.steps, args.seed))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    all_rtts = sorted(r for client in rtts for r in client)
+    client_p99 = sorted(percentile(sorted(client), 99) for client in rtts if client)
+    print_table(f"{args.game}: {args.clients} clients x {args.steps} steps", ["metric", "value"], [
+        ["connect time (s)", f"{connect_time:.2f}"],
+        ["steps/s", len(all_rtts) / elapsed],
+        ["rtt p50 (ms)", _ms(percentile(all_rtts, 50))],
+        ["rtt p90 (ms)", _ms(percentile(all_rtts, 90))],
+        ["rtt p99 (ms)", _ms(percentile(all_rtts, 99))],
+        ["rtt max (ms)", _ms(all_rtts[-1] if all_rtts else 0.0)],
+        ["per-client p99, median (ms)", _ms(percentile(client_p99, 50))],
+        ["per-client p99, worst (ms)", _ms(client_p99[-1] if client_p99 else 0.0)],
+    ])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
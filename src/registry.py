@@ -0,0 +1,90 @@
+"""
+Registry of games and agents for the unified CLI (`python -m src`).
+
+Entries are "module:attribute" strings resolved on demand, so listing games
+or picking one never imports another game's (or gymnasium's) dependencies.
+"""
+import importlib
+from collections import namedtuple
+
+GameSpec = namedtuple("GameSpec", ["env", "game", "config", "play", "agents"])
+
+GAMES = {
+    "flappy": GameSpec(
+        env="src.flappy.env.pygame_flappy_env:PygameFlappyEnv",
+        game="src.flappy.game:FlappyGame",
+        config="src.flappy.game:FlappyConfig",
+        play="src.flappy.app.play_human:main",
+        agents={
+            "random": "src.flappy.agents.random_agent:RandomAgent",
+            "heuristic": "src.flappy.agents.heuristic_agent:HeuristicAgent",
+            "rollout": "src.flappy.agents.rollout_agent:RolloutAgent",
+        },
+    ),
+    "snake": GameSpec(
+        env="src.snake.env.pygame_snake_env:PygameSnakeEnv",
+        game="src.snake.game:SnakeGame",
+        config="src.snake.game:SnakeConfig",
+        play="src.snake.app.play_human:main",
+        agents={
+            "random": "src.snake.agents.random_agent:RandomAgent",
+        },
+    ),
+}
+
+
+def load(path):
+    """Resolve a "module:attribute" string."""
+    module_name, _, attr = path.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def get_game(name):
+    try:
+        return GAMES[name]
+    except KeyError:
+        raise ValueError(f"Unknown game: {name} (choose from {', '.join(GAMES)})") from None
+
+
+def get_agent_class(game, name):
+    spec = get_game(game)
+    try:
+        return load(spec.agents[name])
+    except KeyError:
+        raise ValueError(f"Unknown agent for {game}: {name} (choose from {', '.join(spec.agents)})") from None
+
+
+def make_config(game, overrides=None):
+    """Build the game's config object, applying {field: value} overrides."""
+    config_cls = load(get_game(game).config)
+    overrides = dict(overrides or {})
+    unknown = set(overrides) - set(config_cls._fields)
+    if unknown:
+        raise ValueError(f"Unknown {game} config field(s): {', '.join(sorted(unknown))} "
+                         f"(have {', '.join(config_cls._fields)})")
+    return config_cls(**overrides)
+
+
+def parse_overrides(items):
+    """Parse ["cols=50", "gravity=0.6"] into {"cols": 50, "gravity": 0.6}."""
+    overrides = {}
+    for item in items or ():
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"Expected key=value, got {item!r}")
+        overrides[key.strip()] = _parse_value(value.strip())
+    return overrides
+
+
+def _parse_value(value):
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            pass
+    lowered = value.lower()
+    if lowered in ("true", "false"):
+        return lowered == "true"
+    if lowered in ("none", "null"):
+        return None
+    return value
@@ -0,0 +1,282 @@
+"""
+Episode runner behind `python -m src run`.
+
+One RunSpec describes what a worker does: which game/agent/config, how many
+episodes, and how many envs it steps (a plain env, or a gymnasium
+Sync/AsyncVectorEnv). run() splits episodes across worker processes and
+collects EpisodeResult rows. With an inference server (see src.inference),
+workers get a PolicyClient as their agent and one process runs the policy.
+"""
+import os
+import time
+from collections import namedtuple
+from functools import partial
+
+from src.registry import get_agent_class, get_game, load
+
+RunSpec = namedtuple("RunSpec", [
+    "game", "agent", "config", "episodes", "num_envs", "vec", "seed",
+    "frame_skip", "render", "metrics_dir", "log_steps", "worker", "agent_params",
+    "spectate", "spectate_envs", "policy", "dataset_dir", "dataset_compress",
+], defaults=[None, 5, 1, "sync", None, 1, False, None, True, 0, None, None, 1, None, None, False])
+
+EpisodeResult = namedtuple("EpisodeResult", ["worker", "env", "episode", "steps", "total_reward", "score"])
+
+VEC_MODES = ("sync", "async")
+
+
+def make_agent(spec, action_space):
+    """
+    Instantiate the spec's agent, passing spec.agent_params as keyword
+    arguments, or return spec.policy if actions come from an inference server.
+    """
+    if spec.policy is not None:
+        return spec.policy
+    return get_agent_class(spec.game, spec.agent)(action_space, **(spec.agent_params or {}))
+
+
+def make_env(game, config=None, frame_skip=1, spectate=None, stream=0):
+    """
+    Create the registered env for game, optionally wrapped in FrameSkip and,
+    if spectate is a (host, port) address, in a Spectate publisher.
+    """
+    env = load(get_game(game).env)(config)
+    if spectate is not None:
+        from src.common.wrappers import Spectate
+        env = Spectate(env, spectate, stream)
+    if frame_skip > 1:
+        from src.common.wrappers import FrameSkip
+        env = FrameSkip(env, frame_skip)
+    return env
+
+
+def _env_factory(spec, env_index):
+    """Picklable constructor for env env_index of this worker (for vector envs)."""
+    spectate = spec.spectate if env_index < spec.spectate_envs else None
+    stream = spec.worker * spec.num_envs + env_index
+    return partial(make_env, spec.game, spec.config, spec.frame_skip, spectate, stream)
+
+
+def make_recorder(spec, observation_space, action_space):
+    """TrajectoryWriter for spec.dataset_dir (one shard name per worker), or None."""
+    if not spec.dataset_dir:
+        return None
+    from src.common.dataset import GAME_OBS_ENCODING, TrajectoryWriter
+    return TrajectoryWriter.for_spaces(
+        spec.dataset_dir, observation_space, action_space, encoding=GAME_OBS_ENCODING.get(spec.game, "raw"),
+        num_envs=spec.num_envs, compress=spec.dataset_compress, name=f"shard-w{spec.worker}",
+    )
+
+
+def env_seed(spec, env_index=0):
+    """Seed for one env: distinct across workers and envs, None if unseeded."""
+    if spec.seed is None:
+        return None
+    return spec.seed + spec.worker * spec.num_envs + env_index
+
+
+def run_worker(spec, on_episode=None):
+    """Run spec.episodes episodes in this process and return their results."""
+    if spec.vec not in VEC_MODES:
+        raise ValueError(f"Unknown vectorization mode: {spec.vec} (choose from {', '.join(VEC_MODES)})")
+    metrics = None
+    if spec.metrics_dir:
+        from src.common.metrics import TrainingMetrics
+        metrics = TrainingMetrics(spec.metrics_dir, log_steps=spec.log_steps)
+    try:
+        if spec.num_envs == 1:
+            return _run_single(spec, metrics, on_episode)
+        return _run_vector(spec, metrics, on_episode)
+    finally:
+        if metrics is not None:
+            metrics.close()
+
+
+def _run_single(spec, metrics, on_episode):
+    env = _env_factory(spec, 0)()
+    agent = make_agent(spec, env.action_space)
+    agent.attach([env])
+    recorder = make_recorder(spec, env.observation_space, env.action_space)
+    seed = env_seed(spec)
+    if seed is not None:
+        env.action_space.seed(seed)
+    results = []
+    for episode in range(spec.episodes):
+        # Seed only the first reset; later episodes continue the seeded RNG
+        obs, info = env.reset(seed=seed if episode == 0 else None)
+        done = False
+        total_reward = 0
+        steps = 0
+
+        while not done:
+            action = agent.select_action(obs)
+            prev_obs = obs
+            obs, reward, terminated, truncated, info = env.step(action)
+            done = terminated or truncated
+            if recorder is not None:
+                recorder.add(0, prev_obs, action, reward, terminated, truncated, obs)
+            agent.learn(obs, reward, done, info)
+            total_reward += reward
+            steps += 1
+            if metrics is not None:
+                metrics.step(episode, steps, action, reward)
+            if spec.render:
+                env.render()
+
+        result = EpisodeResult(spec.worker, 0, episode, steps, total_reward, info.get("score", 0))
+        if metrics is not None:
+            metrics.episode(episode, steps, total_reward, result.score)
+        results.append(result)
+        if on_episode is not None:
+            on_episode(result)
+    env.close()
+    if recorder is not None:
+        recorder.close()
+    return results
+
+
+def _run_vector(spec, metrics, on_episode):
+    """
+    Step num_envs envs in lockstep. agent.select_actions() gets the batched
+    observations and agent.learn() the batched (obs, rewards, dones, infos).
+    """
+    import gymnasium as gym
+    import numpy as np
+
+    n = spec.num_envs
+    env_fns = [_env_factory(spec, i) for i in range(n)]
+    vec_cls = gym.vector.AsyncVectorEnv if spec.vec == "async" else gym.vector.SyncVectorEnv
+    envs = vec_cls(env_fns)
+    # The `resetting` bookkeeping below assumes next-step autoreset (gymnasium >= 1.0)
+    autoreset = envs.metadata.get("autoreset_mode")
+    if getattr(autoreset, "value", autoreset) != "NextStep":
+        envs.close()
+        raise RuntimeError(f"Vector envs need next-step autoreset (gymnasium >= 1.0), got {autoreset!r} "
+                           f"with gymnasium {gym.__version__}")
+    agent = make_agent(spec, envs.single_action_space)
+    if spec.vec == "sync":
+        agent.attach(envs.envs)  # async envs live in subprocesses
+    recorder = make_recorder(spec, envs.single_observation_space, envs.single_action_space)
+    seeds = None
+    if spec.seed is not None:
+        seeds = [env_seed(spec, i) for i in range(n)]
+        envs.single_action_space.seed(seeds[0])
+    obs, infos = envs.reset(seed=seeds)
+
+    returns = np.zeros(n)
+    lengths = np.zeros(n, dtype=np.int64)
+    # With next-step autoreset, the step after an episode ends only resets
+    # that env; its reward and action must not be counted.
+    resetting = np.zeros(n, dtype=bool)
+    # Episode ids are handed out as episodes start, so step and episode
+    # metrics rows from concurrently running envs can be matched up.
+    episode_ids = np.arange(n)
+    next_id = n
+    results = []
+    while len(results) < spec.episodes:
+        actions = np.asarray(agent.select_actions(obs))
+        prev_obs = obs
+        obs, rewards, terminated, truncated, infos = envs.step(actions)
+        dones = terminated | truncated
+        agent.learn(obs, rewards, dones, infos)
+        active = ~resetting
+        if recorder is not None:
+            # Final steps are recorded below, only for episodes that count
+            # towards spec.episodes, so the dataset matches the results.
+            for i in np.flatnonzero(active & ~dones):
+                recorder.add(i, prev_obs[i], actions[i], rewards[i], False, False, obs[i])
+        returns[active] += rewards[active]
+        lengths[active] += 1
+        if metrics is not None:
+            for i in np.flatnonzero(active):
+                metrics.step(int(episode_ids[i]), int(lengths[i]), int(actions[i]), float(rewards[i]))
+        finished = np.flatnonzero(dones & active)
+        if len(finished):
+            scores = infos.get("score")
+            for i in finished:
+                if len(results) >= spec.episodes:
+                    break
+                score = int(scores[i]) if scores is not None else 0
+                if recorder is not None:
+                    recorder.add(i, prev_obs[i], actions[i], rewards[i], terminated[i], truncated[i], obs[i])
+                result = EpisodeResult(spec.worker, int(i), int(episode_ids[i]), int(lengths[i]),
+                                       float(returns[i]), score)
+                if metrics is not None:
+                    metrics.episode(result.episode, result.steps, result.total_reward, score)
+                results.append(result)
+                if on_episode is not None:
+                    on_episode(result)
+                episode_ids[i] = next_id
+                next_id += 1
+            returns[finished] = 0.0
+            lengths[finished] = 0
+        resetting = dones
+    envs.close()
+    if recorder is not None:
+        # Episodes still running (or finished past spec.episodes) aren't results
+        for i in range(n):
+            recorder.discard(i)
+        recorder.close()
+    return results
+
+
+def split_episodes(episodes, workers):
+    """Episode count per worker, spreading the remainder over the first workers."""
+    base, extra = divmod(episodes, workers)
+    return [base + (1 if w < extra else 0) for w in range(workers)]
+
+
+def run(spec, workers=1, on_episode=None, inference=None):
+    """
+    Run spec across `workers` processes. Returns (results, elapsed_seconds).
+
+    With more than one worker, each gets its own seed offset and, if metrics
+    are enabled, its own `worker-<n>` subdirectory of spec.metrics_dir.
+
+    inference: optional dict of InferenceServer options (max_batch_size,
+    max_wait, ...). If given, the agent runs in one inference server process
+    and every worker requests its actions from it.
+    """
+    start = time.perf_counter()
+    if workers <= 1:
+        jobs = [spec]
+    else:
+        if spec.render:
+            raise ValueError("Rendering is only supported with a single worker")
+        jobs = []
+        for w, count in enumerate(split_episodes(spec.episodes, workers)):
+            if count == 0:
+                continue
+            metrics_dir = os.path.join(spec.metrics_dir, f"worker-{w}") if spec.metrics_dir else None
+            jobs.append(spec._replace(episodes=count, worker=w, metrics_dir=metrics_dir))
+
+    server = None
+    if inference is not None:
+        from src.inference import InferenceServer
+        server = InferenceServer(spec.game, spec.agent, spec.agent_params, spec.config,
+                                 clients=[job.num_envs for job in jobs], seed=spec.seed, **inference)
+        jobs = [job._replace(policy=policy) for job, policy in zip(jobs, server.start())]
+    try:
+        if workers <= 1:
+            return run_worker(jobs[0], on_episode), time.perf_counter() - start
+        return _run_pool(jobs, on_episode), time.perf_counter() - start
+    finally:
+        if server is not None:
+            server.stop()
+
+
+def _run_pool(jobs, on_episode):
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    results = []
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=len(jobs), mp_context=ctx) as pool:
+        futures = [pool.submit(run_worker, job) for job in jobs]
+        for future in as_completed(futures):
+            for result in future.result():
+                results.append(result)
+                if on_episode is not None:
+                    on_episode(result)
+    results.sort(key=lambda r: (r.worker, r.episode))
+    return results
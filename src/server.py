@@ -0,0 +1,359 @@
+"""
+Game server for agents running in other processes, behind `python -m src serve`.
+
+The server owns one FlappyGame/SnakeGame per connection and steps every
+connection that has an action queued once per tick, encoding all replies of
+a tick in one NumPy batch.
+
+Actions are batched per tick, but the simulation itself is not vectorized:
+each session's game is stepped by its own game.step() call in a loop.
+Vectorizing would mean a second, NumPy implementation of both games that
+must stay bit-for-bit identical to FlappyGame/SnakeGame (same RNG draws,
+same float order) for seeded sessions to match local runs. The per-step
+cost (a few microseconds) is small next to the socket reads and writes, and
+those are what the per-tick batching amortizes.
+
+Clients (see src.client) talk to it over TCP with
+a small fixed-size binary protocol (little endian):
+
+    client hello:   magic "GS", version u8, flags u8 (0), seed i64 (-1 = unseeded)
+    server welcome: magic "GS", version u8, kind u8, obs encoding u8, n_actions u8,
+                    obs rank u8, session id u32, then obs dims (u16 x rank),
+                    followed by one reply with the initial observation
+    client action:  one byte: an action in [0, n_actions), or 255 to reset
+    server reply:   reward f32, flags u8 (bit 0 terminated, bit 1 truncated),
+                    score u32, then the observation
+
+Observations are sent as float32 (Flappy) or as a packed bitmap of the 0/1
+grid (Snake: 100 bytes for a 20x20 board instead of 3200). Every action gets
+exactly one reply, in order; clients may pipeline several actions but each
+connection advances at most one step per tick.
+
+With tick_hz=0 the server ticks as soon as actions are waiting (as fast as
+the clients go); otherwise it ticks at a fixed rate, e.g. 60 for real-time
+matches. Latency is measured per connection from reading an action to
+writing its reply, and summarized every report_interval seconds.
+"""
+import asyncio
+import socket
+import struct
+import time
+from collections import deque
+
+from src.common.lazy import lazy_import
+from src.registry import get_game, load
+
+np = lazy_import("numpy")
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7777
+
+MAGIC = b"GS"
+VERSION = 1
+KIND_FLAPPY = 0
+KIND_SNAKE = 1
+ENC_FLOAT32 = 0
+ENC_BITS = 1
+RESET = 255
+
+HELLO = struct.Struct("<2sBBq")
+WELCOME = struct.Struct("<2sBBBBBI")
+REPLY = struct.Struct("<fBI")
+TERMINATED = 1
+TRUNCATED = 2
+
+# name -> (kind, observation encoding, number of actions)
+GAME_PROTOCOL = {
+    "flappy": (KIND_FLAPPY, ENC_FLOAT32, 2),
+    "snake": (KIND_SNAKE, ENC_BITS, 4),
+}
+
+MAX_PENDING = 64  # queued actions per connection before we stop reading from it
+LATENCY_SAMPLES = 256  # recent latencies kept per connection for percentiles
+
+
+def obs_size(encoding, shape):
+    """Encoded observation size in bytes."""
+    count = 1
+    for dim in shape:
+        count *= dim
+    return 4 * count if encoding == ENC_FLOAT32 else (count + 7) // 8
+
+
+def reply_dtype(encoding, shape):
+    """Packed NumPy dtype of one reply (REPLY header plus observation bytes)."""
+    return np.dtype([("reward", "<f4"), ("flags", "u1"), ("score", "<u4"),
+                     ("obs", "u1", (obs_size(encoding, shape),))])
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not len(sorted_values):
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q / 100 * len(sorted_values)))]
+
+
+class Session:
+    """One connected agent: its game, queued actions and latency stats."""
+
+    def __init__(self, session_id, game, writer, peer):
+        self.id = session_id
+        self.game = game
+        self.writer = writer
+        self.peer = peer
+        self.pending = deque()  # (action, time received)
+        self.resumed = None  # set while the reader waits for the queue to drain
+        self.closed = False
+        self.steps = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.recent = deque(maxlen=LATENCY_SAMPLES)
+
+    def record(self, latency):
+        self.steps += 1
+        self.latency_total += latency
+        if latency > self.latency_max:
+            self.latency_max = latency
+        self.recent.append(latency)
+
+    def stats(self):
+        """Latency summary in milliseconds (percentiles over recent steps)."""
+        recent = sorted(self.recent)
+        return {
+            "id": self.id,
+            "peer": self.peer,
+            "steps": self.steps,
+            "mean_ms": 1000 * self.latency_total / self.steps if self.steps else 0.0,
+            "p50_ms": 1000 * percentile(recent, 50),
+            "p99_ms": 1000 * percentile(recent, 99),
+            "max_ms": 1000 * self.latency_max,
+        }
+
+
+class GameServer:
+    """
+    Asyncio TCP server hosting one game per connection.
+
+    Games are created from the registry (game name plus optional config), so
+    the server serves exactly the same game logic as local runs.
+    """
+
+    def __init__(self, game, config=None, tick_hz=0, report_interval=5.0, verbose=False, log=print):
+        if game not in GAME_PROTOCOL:
+            raise ValueError(f"Game {game!r} cannot be served (choose from {', '.join(GAME_PROTOCOL)})")
+        self.game_name = game
+        self.game_cls = load(get_game(game).game)
+        self.config = config
+        self.kind, self.encoding, self.n_actions = GAME_PROTOCOL[game]
+        self.obs_shape = np.shape(self.game_cls(config).reset())
+        self.dtype = reply_dtype(self.encoding, self.obs_shape)
+        self.tick_interval = 1.0 / tick_hz if tick_hz else 0.0
+        self.report_interval = report_interval
+        self.verbose = verbose
+        self.log = log
+        self.sessions = {}
+        self._next_id = 0
+        self._ready = []  # sessions with at least one queued action
+        self._wakeup = None
+        self._server = None
+        # Totals since the last report
+        self._ticks = 0
+        self._steps = 0
+        self._latencies = []
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self._wakeup = asyncio.Event()
+        self._server = await asyncio.start_server(self._handle, host, port, backlog=4096)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        address = await self.start(host, port)
+        self.log(f"Serving {self.game_name} on {address[0]}:{address[1]} "
+                 f"({'%g ticks/s' % (1 / self.tick_interval) if self.tick_interval else 'unpaced'})")
+        tasks = [asyncio.create_task(self._tick_loop())]
+        if self.report_interval:
+            tasks.append(asyncio.create_task(self._report_loop()))
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def stats(self):
+        """Per-connection latency stats for all connected clients."""
+        return [s.stats() for s in self.sessions.values()]
+
+    # Connections
+
+    async def _handle(self, reader, writer):
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        try:
+            magic, version, _, seed = HELLO.unpack(await reader.readexactly(HELLO.size))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+            return
+        if magic != MAGIC or version != VERSION:
+            writer.close()
+            return
+
+        game = self.game_cls(self.config)
+        game.seed(None if seed < 0 else seed)
+        session = Session(self._next_id, game, writer, writer.get_extra_info("peername"))
+        self._next_id += 1
+        self.sessions[session.id] = session
+        obs = game.reset()
+        writer.write(WELCOME.pack(MAGIC, VERSION, self.kind, self.encoding, self.n_actions,
+                                  len(self.obs_shape), session.id & 0xFFFFFFFF)
+                     + struct.pack(f"<{len(self.obs_shape)}H", *self.obs_shape)
+                     + self._encode([obs], [0.0], [0], [game.score]))
+        try:
+            await self._read_actions(session, reader)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            session.closed = True
+            del self.sessions[session.id]
+            writer.close()
+            if self.verbose:
+                s = session.stats()
+                self.log(f"client {s['id']} {s['peer']} left after {s['steps']} steps: latency "
+                         f"mean {s['mean_ms']:.2f}ms p50 {s['p50_ms']:.2f}ms p99 {s['p99_ms']:.2f}ms "
+                         f"max {s['max_ms']:.2f}ms")
+
+    async def _read_actions(self, session, reader):
+        while True:
+            data = await reader.read(MAX_PENDING)
+            if not data:
+                return
+            now = time.perf_counter()
+            was_idle = not session.pending
+            for action in data:
+                if action >= self.n_actions and action != RESET:
+                    self.log(f"client {session.id}: invalid action {action}, closing")
+                    return
+                session.pending.append((action, now))
+            if was_idle:
+                self._ready.append(session)
+                self._wakeup.set()
+            # Backpressure for pipelining clients; also waits out a full send buffer
+            while len(session.pending) >= MAX_PENDING:
+                session.resumed = asyncio.get_running_loop().create_future()
+                await session.resumed
+            await session.writer.drain()
+
+    # Stepping
+
+    async def _tick_loop(self):
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while True:
+            if self.tick_interval:
+                next_tick += self.tick_interval
+                delay = next_tick - loop.time()
+                if delay < 0:
+                    next_tick = loop.time()  # fell behind: don't burst to catch up
+                await asyncio.sleep(max(delay, 0.0))
+            else:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                await asyncio.sleep(0)  # let actions that arrived together join the batch
+            self._tick()
+
+    def _tick(self):
+        """
+        Step every session with a queued action once and send the replies.
+
+        Games are stepped one by one (see the module docstring); only the
+        reply encoding is a single batched NumPy operation.
+        """
+        ready, self._ready = self._ready, []
+        sessions, obs, rewards, flags, scores, received = [], [], [], [], [], []
+        for session in ready:
+            if session.closed:
+                continue
+            action, t = session.pending.popleft()
+            game = session.game
+            if action == RESET:
+                o, reward = game.reset(), 0.0
+            else:
+                o, reward, _, _ = game.step(action)
+            sessions.append(session)
+            obs.append(o)
+            rewards.append(reward)
+            flags.append((TRUNCATED if game.truncated else TERMINATED) if game.done else 0)
+            scores.append(game.score)
+            received.append(t)
+            if session.pending:
+                self._ready.append(session)
+            if session.resumed is not None and len(session.pending) < MAX_PENDING:
+                session.resumed.set_result(None)
+                session.resumed = None
+        if not sessions:
+            return
+        if self._ready:
+            self._wakeup.set()
+
+        data = memoryview(self._encode(obs, rewards, flags, scores))
+        size = self.dtype.itemsize
+        for i, session in enumerate(sessions):
+            session.writer.write(data[i * size:(i + 1) * size])
+        latencies = time.perf_counter() - np.asarray(received)
+        for session, latency in zip(sessions, latencies.tolist()):
+            session.record(latency)
+        self._ticks += 1
+        self._steps += len(sessions)
+        self._latencies.append(latencies)
+
+    def _encode(self, obs, rewards, flags, scores):
+        """Encode a batch of replies into one contiguous buffer."""
+        replies = np.empty(len(obs), dtype=self.dtype)
+        replies["reward"] = rewards
+        replies["flags"] = flags
+        replies["score"] = scores
+        batch = np.asarray(obs, dtype=np.float32).reshape(len(obs), -1)
+        if self.encoding == ENC_FLOAT32:
+            replies["obs"] = batch.astype("<f4").view(np.uint8)
+        else:
+            replies["obs"] = np.packbits(batch > 0.5, axis=1)
+        return replies.tobytes()
+
+    # Reporting
+
+    async def _report_loop(self):
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(self.report_interval)
+            now = time.perf_counter()
+            if self._steps or self.sessions:
+                self.log(self._report(now - last))
+            else:
+                self._ticks = 0
+            last = now
+
+    def _report(self, elapsed):
+        ticks, steps = self._ticks, self._steps
+        latencies = np.sort(np.concatenate(self._latencies)) if self._latencies else np.zeros(0)
+        self._ticks = self._steps = 0
+        self._latencies = []
+        line = (f"{len(self.sessions)} clients, {steps / elapsed:,.0f} steps/s, {ticks / elapsed:,.0f} ticks/s, "
+                f"mean batch {steps / ticks if ticks else 0:.1f}, latency "
+                f"p50 {1000 * percentile(latencies, 50):.2f}ms p99 {1000 * percentile(latencies, 99):.2f}ms "
+                f"max {1000 * (latencies[-1] if len(latencies) else 0):.2f}ms")
+        slowest = sorted(self.stats(), key=lambda s: s["p99_ms"], reverse=True)[:3]
+        if slowest and slowest[0]["steps"]:
+            line += "; slowest: " + ", ".join(f"#{s['id']} p99 {s['p99_ms']:.2f}ms" for s in slowest)
+        return line
+
+
+def serve(game, config=None, address=(DEFAULT_HOST, DEFAULT_PORT), tick_hz=0, report_interval=5.0,
+          verbose=False, log=print):
+    """Run a GameServer until interrupted."""
+    server = GameServer(game, config, tick_hz=tick_hz, report_interval=report_interval,
+                        verbose=verbose, log=log)
+    try:
+        asyncio.run(server.serve_forever(*address))
+    except KeyboardInterrupt:
+        pass
@@ -1,23 +1,16 @@
 """
 Run the Snake Gym environment with a random agent (headless, prints episode summary).
+
+Equivalent to `python -m src run snake --agent random --episodes 1`.
 """
-from src.snake.env.pygame_snake_env import PygameSnakeEnv
+import sys
 
-def main():
-    env = PygameSnakeEnv()
-    obs, info = env.reset()
-    done = False
-    total_reward = 0
-    steps = 0
 
-    while not done:
-        action = env.action_space.sample()  # random action
-        obs, reward, done, truncated, info = env.step(action)
-        total_reward += reward
-        steps += 1
+def main(argv=None):
+    from src.cli import main as cli_main
+    args = sys.argv[1:] if argv is None else argv
+    return cli_main(["run", "snake", "--agent", "random", "--episodes", "1", *args])
 
-    print(f"Episode finished in {steps} steps, total reward: {total_reward}, info: {info}")
-    env.close()
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -2,7 +2,6 @@
 import gymnasium as gym
 from gymnasium import spaces
 import numpy as np
-import random
 from ..game import SnakeGame
 
 
@@ -11,14 +10,15 @@ class PygameSnakeEnv(gym.Env):
     Gym environment wrapper for Snake game.
     
     Action space: Discrete(4) - [up, right, down, left]
-    Observation space: Box(shape=(20, 20, 2), dtype=float32) - grid with snake and food channels
+    Observation space: Box(shape=(rows, cols, 2), dtype=float32) - grid with snake and food channels
+    (20x20 unless a SnakeConfig is passed)
     """
     
-    metadata = {"render_modes": []}
+    metadata = {"render_modes": [], "render_fps": 10}
     
-    def __init__(self):
+    def __init__(self, config=None):
         super().__init__()
-        self.game = SnakeGame()
+        self.game = SnakeGame(config)
         
         # Action space: 4 discrete actions
         self.action_space = spaces.Discrete(4)
@@ -27,64 +27,44 @@ class PygameSnakeEnv(gym.Env):
         self.observation_space = spaces.Box(
             low=0.0,
             high=1.0,
-            shape=(SnakeGame.ROWS, SnakeGame.COLS, 2),
+            shape=(self.game.ROWS, self.game.COLS, 2),
             dtype=np.float32
         )
     
     def reset(self, seed=None, options=None):
         """Reset the environment."""
+        super().reset(seed=seed)
         if seed is not None:
-            random.seed(seed)
-            np.random.seed(seed)
+            self.game.seed(seed)
         obs = self.game.reset()
         return obs, {}
     
     def step(self, action):
         """Take a step in the environment."""
         obs, reward, done, info = self.game.step(action)
-        # Gymnasium expects (obs, reward, terminated, truncated, info)
-        return obs, reward, done, False, info
+        # Gymnasium expects (obs, reward, terminated, truncated, info); time
+        # limits truncate, so value-based agents should bootstrap from obs.
+        truncated = self.game.truncated
+        return obs, reward, done and not truncated, truncated, info
     
     def render(self):
-        """Render the current game state using Pygame."""
-        import pygame
-        if not hasattr(self, '_screen'):
-            pygame.init()
-            CELL = 20
-            self._screen = pygame.display.set_mode((self.game.COLS * CELL, self.game.ROWS * CELL))
+        """Render the current game state using Pygame (only changed cells are redrawn)."""
+        from src.common import render
+        pygame = render.pygame
+        if not hasattr(self, '_renderer'):
+            # Shrink cells on large boards so the window stays on screen
+            cell = render.snake_cell_size(self.game)
+            screen = render.open_window((self.game.COLS * cell, self.game.ROWS * cell), "Snake")
+            self._renderer = render.SnakeRenderer(self.game, screen, cell)
             self._clock = pygame.time.Clock()
-            self._font = pygame.font.SysFont(None, 32)
-            self._CELL = CELL
-        screen = self._screen
-        game = self.game
-        CELL = self._CELL
         # Process events to keep window responsive
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 import sys
                 sys.exit()
-        # Colors
-        BLACK = (0, 0, 0)
-        GREEN = (0, 200, 0)
-        RED = (200, 0, 0)
-        BLUE = (50, 150, 255)
-        WHITE = (255, 255, 255)
-        # Draw background
-        screen.fill(BLACK)
-        # Draw food
-        if game.food:
-            fx, fy = game.food
-            pygame.draw.rect(screen, RED, pygame.Rect(fx*CELL, fy*CELL, CELL, CELL))
-        # Draw snake
-        for i, (x, y) in enumerate(game.snake):
-            color = GREEN if i == 0 else BLUE
-            pygame.draw.rect(screen, color, pygame.Rect(x*CELL, y*CELL, CELL, CELL))
-        # Draw score
-        score_surf = self._font.render(f"Score: {game.score}", True, WHITE)
-        screen.blit(score_surf, (5, 5))
-        pygame.display.flip()
-        self._clock.tick(10)
+        render.present(self._renderer.draw())
+        self._clock.tick(self.metadata["render_fps"])
     
     def close(self):
         """Clean up resources."""
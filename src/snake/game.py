@@ -3,13 +3,57 @@ Snake game logic - programmatic API for RL training.
 Returns observation, reward, done, info on each step.
 """
 import random
-import numpy as np
+from collections import deque, namedtuple
+
+from src.common.config import check_field_types
+from src.common.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+_SNAKE_FIELDS = {
+    "cols": 20,
+    "rows": 20,
+    # Reward shaping
+    "reward_step": -0.01,  # every move, to encourage efficiency
+    "reward_food": 1.0,  # eating (replaces reward_step for that step)
+    "reward_crash": -1.0,
+    # Time limits: the episode ends as truncated after max_steps moves, or after
+    # max_steps_without_food moves without eating (None: cols * rows, enough
+    # to reach any cell). 0 disables either limit.
+    "max_steps": 0,
+    "max_steps_without_food": None,
+}
+
+_SnakeConfigBase = namedtuple("SnakeConfig", list(_SNAKE_FIELDS),
+                              defaults=list(_SNAKE_FIELDS.values()))
+
+
+class SnakeConfig(_SnakeConfigBase):
+    """Per-instance board and reward settings for SnakeGame."""
+    
+    __slots__ = ()
+    
+    def __new__(cls, *args, **kwargs):
+        self = super().__new__(cls, *args, **kwargs)
+        check_field_types(self, integers=("cols", "rows", "max_steps", "max_steps_without_food"),
+                          optional=("max_steps_without_food",))
+        if self.cols < 4 or self.rows < 1:
+            raise ValueError(f"Board too small for the starting snake: {self.cols}x{self.rows}")
+        if self.max_steps < 0 or (self.max_steps_without_food or 0) < 0:
+            raise ValueError("max_steps and max_steps_without_food must be >= 0 (0 disables a limit)")
+        return self
+    
+    @classmethod
+    def _make(cls, iterable):
+        # namedtuple's _make (and _replace, which uses it) bypass __new__
+        return cls(*iterable)
 
 
 class SnakeGame:
     """Snake game with reset() and step(action) interface."""
     
-    # Game constants matching the app script
+    # Game constants matching the app script (defaults, see SnakeConfig)
     COLS = 20
     ROWS = 20
     
@@ -19,30 +63,58 @@ class SnakeGame:
     ACTION_DOWN = 2
     ACTION_LEFT = 3
     
-    def __init__(self):
-        self.snake = []
+    def __init__(self, config=None):
+        self.config = config if config is not None else SnakeConfig()
+        self.COLS = self.config.cols
+        self.ROWS = self.config.rows
+        self.MAX_STEPS = self.config.max_steps
+        self.MAX_STEPS_WITHOUT_FOOD = self.config.max_steps_without_food
+        if self.MAX_STEPS_WITHOUT_FOOD is None:
+            self.MAX_STEPS_WITHOUT_FOOD = self.COLS * self.ROWS
+        self.snake = deque()  # head at index 0
+        self._occupied = set()
+        self._grid = np.zeros((self.ROWS, self.COLS, 2), dtype=np.float32)
+        self.rng = random.Random()
         self.direction = (1, 0)  # (dx, dy)
         self.food = None
         self.score = 0
         self.steps = 0
+        self.steps_since_food = 0
         self.done = False
-        
+        self.truncated = False  # done because of a time limit, not a crash
+    
+    def seed(self, seed=None):
+        """Seed this game's food placement (independent of other instances)."""
+        self.rng.seed(seed)
+    
     def reset(self):
         """Reset the game to initial state."""
         # Start with 3-segment snake in the middle
         mid_x, mid_y = self.COLS // 2, self.ROWS // 2
-        self.snake = [(mid_x, mid_y), (mid_x - 1, mid_y), (mid_x - 2, mid_y)]
+        self.snake = deque([(mid_x, mid_y), (mid_x - 1, mid_y), (mid_x - 2, mid_y)])
+        self._occupied = set(self.snake)
+        self._grid.fill(0.0)
+        for x, y in self.snake:
+            self._grid[y, x, 0] = 1.0
         self.direction = (1, 0)  # moving right
-        self.food = self._random_cell(exclude=self.snake)
+        self.food = self._random_cell()
         self.score = 0
         self.steps = 0
+        self.steps_since_food = 0
         self.done = False
+        self.truncated = False
+        if self.food:
+            self._grid[self.food[1], self.food[0], 1] = 1.0
         return self._get_obs()
     
     def step(self, action):
         """
         Take one step in the game.
         
+        The episode also ends (done, with self.truncated set) when the
+        MAX_STEPS or MAX_STEPS_WITHOUT_FOOD limit is reached; a crash on
+        that same step still counts as a crash.
+        
         Args:
             action: int in [0, 1, 2, 3] = [up, right, down, left]
         
@@ -66,22 +138,36 @@ class SnakeGame:
         head = (self.snake[0][0] + self.direction[0], self.snake[0][1] + self.direction[1])
         
         # Check collisions
-        reward = -0.01  # small negative reward per step to encourage efficiency
+        reward = self.config.reward_step  # small negative reward per step to encourage efficiency
         if self._is_collision(head):
             self.done = True
-            reward = -1.0  # collision penalty
+            reward = self.config.reward_crash  # collision penalty
         else:
-            self.snake.insert(0, head)
+            self.snake.appendleft(head)
+            self._occupied.add(head)
+            self._grid[head[1], head[0], 0] = 1.0
             if head == self.food:
                 # Ate food
                 self.score += 1
-                reward = 1.0  # food reward
-                self.food = self._random_cell(exclude=self.snake)
+                self.steps_since_food = 0
+                reward = self.config.reward_food  # food reward
+                self._grid[head[1], head[0], 1] = 0.0
+                self.food = self._random_cell()
+                if self.food:
+                    self._grid[self.food[1], self.food[0], 1] = 1.0
             else:
                 # Normal move - remove tail
-                self.snake.pop()
+                tail = self.snake.pop()
+                self._occupied.discard(tail)
+                self._grid[tail[1], tail[0], 0] = 0.0
+                self.steps_since_food += 1
         
         self.steps += 1
+        if not self.done and ((self.MAX_STEPS and self.steps >= self.MAX_STEPS) or
+                              (self.MAX_STEPS_WITHOUT_FOOD and
+                               self.steps_since_food >= self.MAX_STEPS_WITHOUT_FOOD)):
+            self.done = True
+            self.truncated = True
         obs = self._get_obs()
         info = {"score": self.score, "steps": self.steps}
         
@@ -92,21 +178,11 @@ class SnakeGame:
         Return observation as a (ROWS, COLS, 2) numpy array.
         Channel 0: snake body (1 where snake is, 0 elsewhere)
         Channel 1: food location (1 where food is, 0 elsewhere)
-        """
-        obs = np.zeros((self.ROWS, self.COLS, 2), dtype=np.float32)
-        
-        # Mark snake positions
-        for x, y in self.snake:
-            if 0 <= x < self.COLS and 0 <= y < self.ROWS:
-                obs[y, x, 0] = 1.0
         
-        # Mark food position
-        if self.food:
-            fx, fy = self.food
-            if 0 <= fx < self.COLS and 0 <= fy < self.ROWS:
-                obs[fy, fx, 1] = 1.0
-        
-        return obs
+        The grid is maintained incrementally by reset()/step(); this only
+        copies it so callers can keep the returned array.
+        """
+        return self._grid.copy()
     
     def _action_to_direction(self, action):
         """Convert discrete action to direction tuple."""
@@ -129,13 +205,25 @@ class SnakeGame:
         if x < 0 or x >= self.COLS or y < 0 or y >= self.ROWS:
             return True
         # Self collision
-        if pos in self.snake:
+        if pos in self._occupied:
             return True
         return False
     
-    def _random_cell(self, exclude):
-        """Generate random cell not in exclude list."""
-        while True:
-            p = (random.randrange(self.COLS), random.randrange(self.ROWS))
-            if p not in exclude:
-                return p
+    def _random_cell(self):
+        """
+        Generate random cell not covered by the snake, or None if the board is full.
+        
+        Rejection sampling is used while the board is mostly free; once the
+        snake covers half of it the free cells are read off the occupancy
+        grid instead so the cost stays bounded on large, crowded boards.
+        """
+        if len(self._occupied) * 2 < self.COLS * self.ROWS:
+            while True:
+                p = (self.rng.randrange(self.COLS), self.rng.randrange(self.ROWS))
+                if p not in self._occupied:
+                    return p
+        free = np.flatnonzero(self._grid[:, :, 0].ravel() == 0)
+        if len(free) == 0:
+            return None
+        idx = int(free[self.rng.randrange(len(free))])
+        return (idx % self.COLS, idx // self.COLS)
@@ -0,0 +1,272 @@
+"""
+Hyperparameter sweeps with successive halving, behind `python -m src sweep`.
+
+A sweep file (JSON) names the game/agent, a search space and a budget:
+
+    {
+      "game": "snake",
+      "agent": "random",
+      "metric": "score",            # EpisodeResult field, averaged per trial
+      "mode": "max",                # or "min"
+      "seed": 0,
+      "samples": 27,                # random samples; omit for a full grid of list-valued params
+      "min_episodes": 10,           # episodes per trial in the first rung
+      "eta": 3,                     # keep the top 1/eta of trials per rung, budget grows by eta
+      "rungs": 3,
+      "space": {
+        "config.reward_step": [-0.01, -0.005, 0.0],
+        "config.cols": {"randint": [15, 40]},
+        "agent.epsilon": {"loguniform": [0.001, 0.1]},
+        "run.frame_skip": [1, 2]
+      }
+    }
+
+Keys are "config.<field>" (game config), "agent.<kwarg>" (agent constructor)
+or "run.<field>" (frame_skip, num_envs). Values are a list (choice) or one of
+{"uniform": [lo, hi]}, {"loguniform": [lo, hi]}, {"randint": [lo, hi]}.
+
+Each rung only runs the episodes a trial has not run yet: rung r adds a new
+segment of episodes with its own seed, and a trial's score is the mean over
+all its segments. Every finished segment is cached as JSON under
+<out>/trials/, keyed by a hash of everything that affects its outcome, so an
+interrupted sweep resumes where it left off and repeated sweeps reuse work.
+"""
+import hashlib
+import itertools
+import json
+import math
+import os
+import random
+from collections import namedtuple
+
+from src.registry import get_game, make_config
+
+Trial = namedtuple("Trial", ["trial_id", "params"])
+
+SPACE_SECTIONS = ("config", "agent", "run")
+RUN_PARAMS = ("frame_skip", "num_envs")
+METRICS = ("score", "total_reward", "steps")
+
+
+def load_sweep(path):
+    with open(path) as f:
+        sweep = json.load(f)
+    return validate_sweep(sweep)
+
+
+def validate_sweep(sweep):
+    sweep = dict(sweep)
+    for key in ("game", "space"):
+        if key not in sweep:
+            raise ValueError(f"Sweep is missing {key!r}")
+    spec = get_game(sweep["game"])
+    sweep.setdefault("agent", "random")
+    if sweep["agent"] not in spec.agents:
+        raise ValueError(f"Unknown agent for {sweep['game']}: {sweep['agent']}")
+    sweep.setdefault("metric", "score")
+    if sweep["metric"] not in METRICS:
+        raise ValueError(f"metric must be one of {', '.join(METRICS)}")
+    sweep.setdefault("mode", "max")
+    if sweep["mode"] not in ("max", "min"):
+        raise ValueError("mode must be 'max' or 'min'")
+    sweep.setdefault("seed", 0)
+    if not isinstance(sweep["seed"], int) or isinstance(sweep["seed"], bool):
+        raise ValueError(f"seed must be an integer, got {sweep['seed']!r}")
+    sweep.setdefault("min_episodes", 10)
+    sweep.setdefault("eta", 3)
+    sweep.setdefault("rungs", 3)
+    if sweep["eta"] < 2 or sweep["rungs"] < 1 or sweep["min_episodes"] < 1:
+        raise ValueError("Need eta >= 2, rungs >= 1 and min_episodes >= 1")
+    for name in sweep["space"]:
+        section, _, field = name.partition(".")
+        if section not in SPACE_SECTIONS or not field:
+            raise ValueError(f"Search space key {name!r} must start with one of "
+                             f"{', '.join(s + '.' for s in SPACE_SECTIONS)}")
+        if section == "run" and field not in RUN_PARAMS:
+            raise ValueError(f"run.{field} is not sweepable (choose from {', '.join(RUN_PARAMS)})")
+    return sweep
+
+
+def sample_trials(sweep):
+    """Expand the search space into trials, deterministically for a given seed."""
+    space = sweep["space"]
+    names = sorted(space)
+    samples = sweep.get("samples")
+    if samples is None:
+        if not all(isinstance(space[n], list) for n in names):
+            raise ValueError("Distributions need 'samples'; only list-valued spaces can be gridded")
+        combos = itertools.product(*(space[n] for n in names))
+        return [Trial(i, dict(zip(names, combo))) for i, combo in enumerate(combos)]
+    rng = random.Random(sweep["seed"])
+    return [Trial(i, {n: _sample(rng, n, space[n]) for n in names}) for i in range(samples)]
+
+
+def _sample(rng, name, dist):
+    if isinstance(dist, list):
+        return rng.choice(dist)
+    if not isinstance(dist, dict) or len(dist) != 1:
+        raise ValueError(f"Bad distribution for {name}: {dist!r}")
+    (kind, (lo, hi)), = dist.items()
+    if kind == "uniform":
+        return rng.uniform(lo, hi)
+    if kind == "loguniform":
+        return math.exp(rng.uniform(math.log(lo), math.log(hi)))
+    if kind == "randint":
+        return rng.randint(lo, hi)
+    raise ValueError(f"Unknown distribution {kind!r} for {name}")
+
+
+def split_params(params):
+    """Split flat "section.field" params into (config, agent, run) dicts."""
+    parts = {section: {} for section in SPACE_SECTIONS}
+    for name, value in params.items():
+        section, _, field = name.partition(".")
+        parts[section][field] = value
+    return parts["config"], parts["agent"], parts["run"]
+
+
+def rung_budgets(sweep):
+    """Cumulative episodes per trial at each rung."""
+    return [sweep["min_episodes"] * sweep["eta"] ** r for r in range(sweep["rungs"])]
+
+
+def segment_key(sweep, params, segment, episodes):
+    """Hash of everything that determines a segment's results."""
+    config, agent_params, run_params = split_params(params)
+    key = {
+        "game": sweep["game"],
+        "agent": sweep["agent"],
+        "config": make_config(sweep["game"], config)._asdict(),
+        "agent_params": agent_params,
+        "run": {k: run_params.get(k, 1) for k in RUN_PARAMS},
+        "seed": sweep["seed"],
+        "segment": segment,
+        "episodes": episodes,
+    }
+    blob = json.dumps(key, sort_keys=True, default=str).encode()
+    return hashlib.sha1(blob).hexdigest()[:16]
+
+
+def run_segment(job):
+    """Run one trial segment; executed in a worker process."""
+    from src.runner import RunSpec, run_worker
+
+    sweep, params, segment, episodes = job
+    config, agent_params, run_params = split_params(params)
+    spec = RunSpec(
+        game=sweep["game"], agent=sweep["agent"], config=make_config(sweep["game"], config),
+        episodes=episodes, seed=sweep["seed"] + 7919 * segment,
+        agent_params=agent_params, **run_params,
+    )
+    results = run_worker(spec)
+    return {
+        "episodes": len(results),
+        "score": [r.score for r in results],
+        "total_reward": [r.total_reward for r in results],
+        "steps": [r.steps for r in results],
+    }
+
+
+class SegmentCache:
+    """One JSON file per finished segment, written atomically."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        try:
+            with open(self._path(key)) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def put(self, key, value):
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(value, f)
+        os.replace(tmp, path)
+
+
+def run_sweep(sweep, out_dir, workers=1, log=print):
+    """
+    Run successive halving over the sweep's trials.
+
+    Returns the final leaderboard: a list of (trial, metric, episodes) sorted
+    best first, for the trials that reached the last rung they were run in.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    import multiprocessing
+
+    cache = SegmentCache(os.path.join(out_dir, "trials"))
+    trials = sample_trials(sweep)
+    budgets = rung_budgets(sweep)
+    metric, reverse = sweep["metric"], sweep["mode"] == "max"
+    segments = {t.trial_id: [] for t in trials}  # finished segment results per trial
+    alive = list(trials)
+    leaderboard = []
+
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        for rung, budget in enumerate(budgets):
+            episodes = budget - (budgets[rung - 1] if rung else 0)
+            jobs, hits = {}, 0
+            for trial in alive:
+                key = segment_key(sweep, trial.params, rung, episodes)
+                cached = cache.get(key)
+                if cached is not None:
+                    segments[trial.trial_id].append(cached)
+                    hits += 1
+                else:
+                    jobs[key] = (trial, (sweep, trial.params, rung, episodes))
+            log(f"rung {rung}: {len(alive)} trials x {budget} episodes "
+                f"({hits} cached, {len(jobs)} to run)")
+
+            if pool is None:
+                for key, (trial, job) in jobs.items():
+                    result = run_segment(job)
+                    cache.put(key, result)
+                    segments[trial.trial_id].append(result)
+            else:
+                futures = {pool.submit(run_segment, job): (key, trial) for key, (trial, job) in jobs.items()}
+                for future in as_completed(futures):
+                    key, trial = futures[future]
+                    result = future.result()
+                    cache.put(key, result)
+                    segments[trial.trial_id].append(result)
+
+            scored = [(t, _mean(segments[t.trial_id], metric), budget) for t in alive]
+            scored.sort(key=lambda item: item[1], reverse=reverse)
+            leaderboard = scored
+            for trial, value, _ in scored[:5]:
+                log(f"  trial {trial.trial_id}: {metric}={value:.3f} {trial.params}")
+            keep = max(1, len(alive) // sweep["eta"])
+            if keep == 1:
+                break  # a single survivor gains nothing from more episodes
+            alive = [t for t, _, _ in scored[:keep]]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    write_leaderboard(os.path.join(out_dir, "leaderboard.json"), leaderboard, metric)
+    return leaderboard
+
+
+def _mean(segment_results, metric):
+    values = [v for seg in segment_results for v in seg[metric]]
+    return sum(values) / len(values) if values else float("nan")
+
+
+def write_leaderboard(path, leaderboard, metric):
+    rows = [{"trial": t.trial_id, metric: value, "episodes": episodes, "params": t.params}
+            for t, value, episodes in leaderboard]
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(rows, f, indent=2)
+    os.replace(tmp, path)